@@ -0,0 +1,252 @@
+"""Консольный запуск экспериментов без GUI.
+
+Пример:
+    python -m assignment run --n 500 --experiments 100000 --dist concentrated \
+        --alpha 0.12:0.2 --beta 0.93:0.98 --workers 8 > results.csv
+    python -m assignment sweep --n 15,25 --dist uniform,concentrated \
+        --beta 0.93:0.98,0.95:0.99 --experiments 10000 --seed 1 > grid.csv
+"""
+import argparse
+import os
+import sys
+
+
+def _range(text):
+    """Разбирает диапазон вида 'min:max'"""
+    try:
+        low, high = (float(part.replace(',', '.')) for part in text.split(':'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"ожидается диапазон вида min:max, получено '{text}'")
+    return low, high
+
+
+def _list(item_type):
+    """Разбирает список через запятую: '15,25,50' или '0.12:0.2,0.1:0.15'"""
+    def parse(text):
+        return [item_type(part) for part in text.split(',') if part]
+    return parse
+
+
+def _beta_range(beta):
+    """Ограничивает beta_max один раз до запуска блоков, а не в каждом генераторе каждого процесса"""
+    from matgen import BETA_MAX_LIMIT
+
+    low, high = beta
+    if high >= 1.0:
+        print(f"Внимание: beta_max {high} заменен на {BETA_MAX_LIMIT} для гарантии убывания", file=sys.stderr)
+        high = BETA_MAX_LIMIT
+    return low, high
+
+
+def _experiment_kwargs(args):
+    """Параметры генератора и запуска из аргументов командной строки"""
+    beta_min, beta_max = _beta_range(args.beta)
+    return dict(
+        n=args.n,
+        v=args.v,
+        distribution_type=args.dist,
+        a_min=args.alpha[0],
+        a_max=args.alpha[1],
+        beta_min=beta_min,
+        beta_max=beta_max,
+        x=args.x,
+        workers=args.workers,
+        seed=args.seed,
+        chunk_size=args.chunk_size,
+        dtype=args.dtype,
+        backend=args.backend,
+    )
+
+
+def _print_summary(stats, names, file):
+    for name in names:
+        total = stats[name]
+        low, high = total.confidence_interval()
+        line = (f"{name}: сумма {total.mean * total.count:.3f}, среднее {total.mean:.4f} "
+                f"(95% ДИ {low:.4f}..{high:.4f}), ст. откл. {total.std:.4f}, "
+                f"медиана {total.quantile(0.5):.4f}, 5%..95%: {total.quantile(0.05):.4f}..{total.quantile(0.95):.4f}")
+        ratio = stats.get(f"{name} / Munkres-Max")
+        if ratio is not None:
+            line += f", от идеала {ratio.mean * 100:.2f}% (5%: {ratio.quantile(0.05) * 100:.2f}%)"
+        print(line, file=file)
+
+
+def run(args):
+    """Выводит итоги каждого эксперимента в CSV по мере готовности блоков"""
+    # numpy и решатели загружаются только для реального запуска, не для --help
+    from runner import STRATEGIES, iter_experiments, iter_store_experiments
+    from stats import experiment_stats, merge_stats
+
+    if args.store is not None:
+        # Матрицы из сохраненного набора, параметры генератора не используются
+        chunks = iter_store_experiments(
+            args.store, x=args.x, workers=args.workers, chunk_size=args.chunk_size, stop=args.experiments,
+            backend=args.backend,
+        )
+    else:
+        experiments = 100 if args.experiments is None else args.experiments
+        chunks = iter_experiments(experiments, **_experiment_kwargs(args))
+
+    out = sys.stdout
+    out.write(",".join(("experiment",) + STRATEGIES) + "\n")
+    stats = {}
+    done = 0
+    for chunk in chunks:
+        rows = zip(*(chunk[name] for name in STRATEGIES))
+        for totals in rows:
+            done += 1
+            out.write(f"{done}," + ",".join(f"{total:.6f}" for total in totals) + "\n")
+        merge_stats(stats, experiment_stats(chunk))
+        out.flush()
+
+    print(f"Экспериментов: {done}", file=sys.stderr)
+    _print_summary(stats, STRATEGIES, sys.stderr)
+
+
+def adaptive(args):
+    """Эксперименты до определения лучшей эвристики, выводит итоговую статистику"""
+    from runner import STRATEGIES, run_adaptive
+
+    stats, info = run_adaptive(
+        max_experiments=args.max_experiments,
+        min_experiments=args.min_experiments,
+        max_seconds=args.max_seconds,
+        level=args.level,
+        target=args.target,
+        **_experiment_kwargs(args)
+    )
+
+    reasons = {"settled": "ранжирование определено", "budget": "исчерпан бюджет экспериментов", "time": "исчерпан бюджет времени"}
+    low, high = info["difference"]
+    print(f"Использовано экспериментов: {info['experiments']} ({reasons[info['reason']]}, проверок: {info['looks']})")
+    print(f"Лучшая: {info['best']}, вторая: {info['second']}, разность средних: {low:.5f}..{high:.5f}")
+    _print_summary(stats, STRATEGIES, sys.stdout)
+
+
+def generate(args):
+    """Создает набор матриц на диске (store.MatrixStore)"""
+    from store import MatrixStore
+
+    beta_min, beta_max = _beta_range(args.beta)
+    store = MatrixStore.create(
+        args.path,
+        args.count,
+        seed=args.seed,
+        chunk_size=args.chunk_size,
+        n=args.n,
+        v=args.n if args.v is None else args.v,
+        distribution_type=args.dist,
+        a_min=args.alpha[0],
+        a_max=args.alpha[1],
+        beta_min=beta_min,
+        beta_max=beta_max,
+        dtype=args.dtype,
+    )
+    print(f"{store.data_path}: {len(store)} матриц {store.shape[1]}x{store.shape[2]}, seed {store.header['seed']}")
+
+
+def sweep(args):
+    """Сетка параметров: строка CSV со средними итогами на каждую ячейку"""
+    from runner import STRATEGIES
+    from sweep import grid_cells, run_grid
+
+    cells = grid_cells(
+        n=args.n,
+        v=args.v or (None,),
+        distribution_type=args.dist,
+        alpha=args.alpha,
+        beta=[_beta_range(beta) for beta in args.beta],
+    )
+    columns = ("n", "v", "distribution_type", "a_min", "a_max", "beta_min", "beta_max")
+    out = sys.stdout
+    out.write(",".join(columns + ("cached",) + STRATEGIES + tuple(f"{name} %" for name in STRATEGIES)) + "\n")
+
+    def on_cell(index, params, stats, cached):
+        means = [f"{stats[name].mean:.6f}" for name in STRATEGIES]
+        ratios = [f"{stats[name + ' / Munkres-Max'].mean * 100:.3f}" if name != "Munkres-Max" else "100.000"
+                  for name in STRATEGIES]
+        out.write(",".join([str(params[column]) for column in columns] + [str(int(cached))] + means + ratios) + "\n")
+        out.flush()
+        print(f"Ячейка {index + 1} из {len(cells)}" + (" (из кэша)" if cached else ""), file=sys.stderr)
+
+    run_grid(
+        cells,
+        args.experiments,
+        x=args.x,
+        seed=args.seed,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        cache_dir=args.cache_dir,
+        on_cell=on_cell,
+        backend=args.backend,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="assignment", description="Эксперименты без GUI")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    execution = argparse.ArgumentParser(add_help=False)
+    execution.add_argument("--x", type=int, default=None, help="точка переключения гибридных стратегий, по умолчанию v // 2")
+    execution.add_argument("--workers", type=int, default=None, help="число процессов, по умолчанию все ядра")
+    execution.add_argument("--seed", type=int, default=None)
+    execution.add_argument("--chunk-size", type=int, default=100, help="экспериментов в одном блоке")
+    execution.add_argument("--backend", choices=["numpy", "numba"], default=None,
+                           help="циклы стратегий: numba (по умолчанию, если установлена) или numpy")
+
+    generator = argparse.ArgumentParser(add_help=False)
+    generator.add_argument("--n", type=int, default=15, help="число партий (строк)")
+    generator.add_argument("--v", type=int, default=None, help="число этапов (столбцов), по умолчанию n")
+    generator.add_argument("--dist", choices=["uniform", "concentrated"], default="uniform")
+    generator.add_argument("--alpha", type=_range, default=(0.12, 0.2), help="сахаристость min:max")
+    generator.add_argument("--beta", type=_range, default=(0.93, 0.98), help="коэффициент деградации min:max")
+    generator.add_argument("--dtype", choices=["float64", "float32"], default="float64",
+                           help="тип матриц: float32 вдвое экономит память")
+
+    common = argparse.ArgumentParser(add_help=False, parents=[execution, generator])
+
+    run_parser = subparsers.add_parser("run", parents=[common], help="Монте-Карло эксперимент")
+    run_parser.add_argument("--experiments", type=int, default=None,
+                            help="число экспериментов (по умолчанию 100, с --store - весь набор)")
+    run_parser.add_argument("--store", default=None, help="брать матрицы из набора, созданного командой generate")
+    run_parser.set_defaults(func=run)
+
+    generate_parser = subparsers.add_parser("generate", parents=[generator], help="сохранить набор матриц на диск")
+    generate_parser.add_argument("path", help="путь набора (создаются PATH.npy и PATH.json)")
+    generate_parser.add_argument("--count", type=int, required=True, help="число матриц")
+    generate_parser.add_argument("--seed", type=int, default=None)
+    generate_parser.add_argument("--chunk-size", type=int, default=100, help="матриц в одном блоке генерации")
+    generate_parser.set_defaults(func=generate)
+
+    adaptive_parser = subparsers.add_parser("adaptive", parents=[common], help="эксперимент до определения лучшей стратегии")
+    adaptive_parser.add_argument("--max-experiments", type=int, default=1000000)
+    adaptive_parser.add_argument("--min-experiments", type=int, default=200)
+    adaptive_parser.add_argument("--max-seconds", type=float, default=None)
+    adaptive_parser.add_argument("--level", type=float, default=0.95, help="уровень доверия на весь запуск, с учетом повторных проверок")
+    adaptive_parser.add_argument("--target", type=float, default=0.0,
+                                 help="достаточная полуширина интервала разности (стратегии равны с этой точностью)")
+    adaptive_parser.set_defaults(func=adaptive)
+
+    sweep_parser = subparsers.add_parser("sweep", parents=[execution], help="эксперимент по сетке параметров")
+    sweep_parser.add_argument("--n", type=_list(int), default=[15], help="размеры через запятую: 15,25,50")
+    sweep_parser.add_argument("--v", type=_list(int), default=None, help="числа этапов через запятую, по умолчанию v = n")
+    sweep_parser.add_argument("--dist", type=_list(str), default=["uniform"], help="uniform,concentrated")
+    sweep_parser.add_argument("--alpha", type=_list(_range), default=[(0.12, 0.2)], help="диапазоны через запятую: 0.12:0.2,0.1:0.15")
+    sweep_parser.add_argument("--beta", type=_list(_range), default=[(0.93, 0.98)], help="диапазоны через запятую")
+    sweep_parser.add_argument("--experiments", type=int, default=1000, help="экспериментов на ячейку")
+    sweep_parser.add_argument("--cache-dir", default="sweep_cache", help="каталог с результатами ячеек")
+    sweep_parser.set_defaults(func=sweep)
+
+    args = parser.parse_args(argv)
+    try:
+        args.func(args)
+    except ValueError as e:
+        parser.error(str(e))
+    except BrokenPipeError:
+        # Вывод закрыт раньше времени (например, `| head`)
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
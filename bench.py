@@ -0,0 +1,401 @@
+import argparse
+import subprocess
+import sys
+import time
+import numpy as np
+from matgen import MatrixGenerator, algo
+from runner import HEURISTICS, STRATEGIES
+from solvers import SOLVERS, auction, lapjv, lapjv_topk, sparse_lapjv, top_k_candidates
+
+
+def _timeit(func, *args, repeat=1):
+    best = np.inf
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_solvers(sizes=(15, 100, 500, 2000), munkres_limit=500):
+    """Сравнение точных решателей (задача на максимум, как в Munkres_Alg_Max)"""
+    print(f"{'n':>6} {'jv, с':>10} {'munkres, с':>12} {'ускорение':>10}")
+    for n in sizes:
+        D = MatrixGenerator(n, n).get_D_matrix()
+        cost = D.max() - D
+        repeat = 5 if n <= 100 else 1
+
+        t_jv, (rows, cols) = _timeit(SOLVERS["jv"], cost, repeat=repeat)
+        if n > munkres_limit:
+            print(f"{n:>6} {t_jv:>10.4f} {'-':>12} {'-':>10}")
+            continue
+
+        t_mk, (rows_mk, cols_mk) = _timeit(SOLVERS["munkres"], cost, repeat=repeat)
+        if not np.isclose(D[rows, cols].sum(), D[rows_mk, cols_mk].sum()):
+            raise RuntimeError(f"Решатели разошлись при n={n}")
+        print(f"{n:>6} {t_jv:>10.4f} {t_mk:>12.4f} {t_mk / t_jv:>9.1f}x")
+
+
+def bench_batch(k=100000, n=25, chunk_size=1000):
+    """Эвристики Монте-Карло: цикл по экземплярам против пакетного режима.
+
+    Пакеты считаются блоками по chunk_size, как в runner: по отдельному ядру
+    на стратегию и одним проходом algo.Heuristics_Batch.
+    """
+    gen = MatrixGenerator(n, n)
+    x = n // 2
+    loop_k = min(k, 2000)
+
+    start = time.perf_counter()
+    for _ in range(loop_k):
+        a = algo(MatrixGenerator(n, n).get_D_matrix())
+        a.Greedy()
+        a.Thrifty()
+        a.Greedy_Thrifty(x)
+        a.Thrifty_Greedy(x)
+    t_loop = (time.perf_counter() - start) * k / loop_k
+
+    chunks = [gen.generate_batch(min(chunk_size, k - begin)) for begin in range(0, k, chunk_size)]
+    start = time.perf_counter()
+    for batch in chunks:
+        algo.Greedy_Batch(batch)
+        algo.Thrifty_Batch(batch)
+        algo.Greedy_Thrifty_Batch(batch, x)
+        algo.Thrifty_Greedy_Batch(batch, x)
+    t_batch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for batch in chunks:
+        algo.Heuristics_Batch(batch, x)
+    t_single = time.perf_counter() - start
+
+    print(f"k={k}, {n}x{n}: цикл ~{t_loop:.1f} с (экстраполяция с {loop_k}), "
+          f"пакетно по стратегиям {t_batch:.2f} с ({t_loop / t_batch:.0f}x), "
+          f"одним проходом {t_single:.2f} с ({t_loop / t_single:.0f}x)")
+
+
+def bench_sweep(sizes=(50, 300), seed=0):
+    """hybrid_sweep против отдельных Greedy_Thrifty(x) / Thrifty_Greedy(x) для x = 0..v"""
+    rng = np.random.default_rng(seed)
+    for n in sizes:
+        D = MatrixGenerator(n, n, rng=rng).get_D_matrix()
+
+        def loop():
+            a = algo(D)
+            return ([a.Greedy_Thrifty(x)[0] for x in range(n + 1)],
+                    [a.Thrifty_Greedy(x)[0] for x in range(n + 1)])
+
+        t_loop, expected = _timeit(loop)
+        t_sweep, swept = _timeit(lambda: algo(D).hybrid_sweep())
+        if not all(np.array_equal(a, b) for a, b in zip(expected, swept)):
+            raise RuntimeError(f"hybrid_sweep разошелся с отдельными вызовами при n={n}")
+        print(f"{n:>6}: по одному x {t_loop:.3f} с, hybrid_sweep {t_sweep:.3f} с ({t_loop / t_sweep:.1f}x)")
+
+
+def bench_incremental(sizes=(200, 1000), seed=0):
+    """Пересчет всех стратегий после правки одной ячейки / строки против нового решения"""
+    rng = np.random.default_rng(seed)
+    for n in sizes:
+        D = MatrixGenerator(n, n, "concentrated", rng=rng).get_D_matrix()
+        a = algo(D, incremental=True)
+        # Аукцион не пересчитывается инкрементально, в сравнение не входит
+        solve = lambda a: {key: a.solve(key) for key in STRATEGIES}
+        t_full, _ = _timeit(solve, a)
+
+        edited = D.copy()
+        edited[n // 2, n // 3] *= 1.05
+        t_cell, _ = _timeit(lambda: (a.update(edited), solve(a)))
+        edited = edited.copy()
+        edited[n // 4] *= 0.97
+        t_row, result = _timeit(lambda: (a.update(edited), solve(a)))
+
+        reference = solve(algo(edited))
+        if not all(np.isclose(result[1][key][0], reference[key][0]) for key in reference):
+            raise RuntimeError(f"Инкрементальный пересчет разошелся при n={n}")
+        print(f"{n:>6}: заново {t_full:.3f} с, ячейка {t_cell:.4f} с ({t_full / t_cell:.0f}x), "
+              f"строка {t_row:.4f} с ({t_full / t_row:.0f}x)")
+
+
+def bench_topk(sizes=(200, 500, 1000), k=8, seed=0):
+    """Граф k лучших кандидатов против плотного lapjv (задача на максимум).
+
+    Отклонение - решение только на графе кандидатов, без проверки и плотного
+    решения; lapjv_topk всегда возвращает оптимум.
+    """
+    rng = np.random.default_rng(seed)
+    print(f"{'n':>6} {'матрица':>10} {'плотный, с':>11} {'topk, с':>9} {'отклонение на графе':>20}")
+    for n in sizes:
+        for name, D in (("случайная", rng.random((n, n))),
+                        ("генератор", MatrixGenerator(n, n, "concentrated", rng=rng).get_D_matrix())):
+            t_dense, (rows, cols) = _timeit(lapjv, D, True)
+            best = D[rows, cols].sum()
+            t_topk, (rows_k, cols_k) = _timeit(lapjv_topk, D, True, k)
+            if not np.isclose(D[rows_k, cols_k].sum(), best):
+                raise RuntimeError(f"lapjv_topk разошелся с lapjv при n={n}")
+
+            try:
+                rows_k, cols_k = sparse_lapjv(*top_k_candidates(D, k, True), n, True)
+                gap = f"{(best - D[rows_k, cols_k].sum()) / best:.2e}"
+            except ValueError:
+                gap = "нет назначения"
+            print(f"{n:>6} {name:>10} {t_dense:>11.3f} {t_topk:>9.3f} {gap:>20}")
+
+
+def bench_auction(sizes=(50, 200, 500), tolerances=(1e-2, 1e-4), munkres_limit=200, seed=0):
+    """Аукцион против точных решателей (задача на максимум): время и отклонение от оптимума.
+
+    Граница - max(n, m) * eps; при tolerance eps = tolerance * разброс / n.
+    """
+    from solvers import auction_epsilon
+
+    rng = np.random.default_rng(seed)
+    print(f"{'n':>6} {'jv, с':>8} {'munkres, с':>11} {'допуск':>8} {'аукцион, с':>11} {'отклонение':>11} {'граница':>9}")
+    for n in sizes:
+        D = MatrixGenerator(n, n, "concentrated", rng=rng).get_D_matrix()
+        t_jv, (rows, cols) = _timeit(lapjv, D, True)
+        best = D[rows, cols].sum()
+        t_mk = "-"
+        if n <= munkres_limit:
+            t_mk = f"{_timeit(SOLVERS['munkres'], D, True)[0]:.3f}"
+        for tolerance in tolerances:
+            epsilon = auction_epsilon(D, tolerance)
+            t_auction, (rows_a, cols_a) = _timeit(auction, D, True, epsilon)
+            gap = best - D[rows_a, cols_a].sum()
+            if gap > n * epsilon + 1e-12:
+                raise RuntimeError(f"Аукцион превысил границу при n={n}")
+            print(f"{n:>6} {t_jv:>8.3f} {t_mk:>11} {tolerance:>8.0e} {t_auction:>11.3f} {gap:>11.2e} {n * epsilon:>9.2e}")
+
+
+def bench_warm_start(cases=((25, 1000), (200, 20)), seed=0):
+    """Точные min и max для серии матриц: без теплого старта и с потенциалами предыдущей матрицы"""
+    rng = np.random.default_rng(seed)
+    for n, k in cases:
+        batch = MatrixGenerator(n, n, "concentrated", rng=rng).generate_batch(k)
+
+        def solve(warm):
+            totals = np.empty((k, 2))
+            previous = None
+            for i, matrix in enumerate(batch):
+                a = algo(matrix, warm_start=previous if warm else None)
+                totals[i] = a.Munkres_Alg()[0], a.Munkres_Alg_Max()[0]
+                previous = a
+            return totals
+
+        t_cold, cold = _timeit(solve, False)
+        t_warm, warm = _timeit(solve, True)
+        if not np.allclose(cold, warm):
+            raise RuntimeError(f"Теплый старт изменил оптимум при n={n}")
+        print(f"{n:>6} x {k}: min+max заново {t_cold:.3f} с, с теплым стартом {t_warm:.3f} с "
+              f"({t_cold / t_warm:.1f}x)")
+
+
+def _numba_missing():
+    from kernels import resolve_backend
+
+    if resolve_backend() == "numba":
+        return False
+    print("numba не установлена: сравнение бэкендов пропущено")
+    return True
+
+
+def check_backends(shapes=((5, 5), (6, 9), (9, 6), (25, 25), (100, 100)), k=50, seed=0):
+    """Бэкенды numpy и numba дают одинаковые назначения и итоги"""
+    if _numba_missing():
+        return
+    rng = np.random.default_rng(seed)
+    for n, v in shapes:
+        batch = MatrixGenerator(n, v, rng=rng).generate_batch(k)
+        # Равные значения проверяют выбор первой строки при совпадениях
+        batch[::3] = np.round(batch[::3], 2)
+        x = v // 2
+        for matrix in batch[:10]:
+            a_numpy, a_numba = algo(matrix, backend="numpy"), algo(matrix, backend="numba")
+            for key in STRATEGIES:
+                if not np.array_equal(a_numpy.solve(key, x)[1], a_numba.solve(key, x)[1]):
+                    raise RuntimeError(f"Бэкенды разошлись: {key}, {n}x{v}")
+            for maximize in (False, True):
+                if not np.array_equal(lapjv(matrix, maximize, backend="numpy")[1], lapjv(matrix, maximize, backend="numba")[1]):
+                    raise RuntimeError(f"Бэкенды разошлись: lapjv, {n}x{v}")
+
+        packed_numpy = algo.Heuristics_Batch(batch, x, "numpy")
+        packed_numba = algo.Heuristics_Batch(batch, x, "numba")
+        for name in HEURISTICS:
+            if not all(np.array_equal(a, b) for a, b in zip(packed_numpy[name], packed_numba[name])):
+                raise RuntimeError(f"Бэкенды разошлись: {name} (пакет), {n}x{v}")
+        if not all(np.array_equal(a, b) for a, b in zip(algo.hybrid_sweep_batch(batch, "numpy"), algo.hybrid_sweep_batch(batch, "numba"))):
+            raise RuntimeError(f"Бэкенды разошлись: hybrid_sweep_batch, {n}x{v}")
+    print(f"numpy и numba совпадают: {len(shapes)} размеров, {k} матриц на размер")
+
+
+def bench_backends(sizes=((25, 200), (100, 20), (500, 2)), batch_k=10000, seed=0):
+    """Время стратегий на numpy и numba: (n, число матриц) и пакет эвристик 25x25"""
+    if _numba_missing():
+        return
+    rng = np.random.default_rng(seed)
+    # Компиляция ядер не входит в замеры
+    warmup = MatrixGenerator(5, 5, rng=rng).generate_batch(2)
+    algo(warmup[0], backend="numba").solve_all()
+    algo.Heuristics_Batch(warmup, 2, "numba")
+
+    print(f"{'стратегия':>16} {'n':>5} {'numpy, мс':>10} {'numba, мс':>10} {'ускорение':>10}")
+    for n, count in sizes:
+        batch = MatrixGenerator(n, n, "concentrated", rng=rng).generate_batch(count)
+        for key in STRATEGIES:
+            times = []
+            for backend in ("numpy", "numba"):
+                start = time.perf_counter()
+                for matrix in batch:
+                    algo(matrix, backend=backend).solve(key)
+                times.append((time.perf_counter() - start) / count * 1e3)
+            print(f"{key:>16} {n:>5} {times[0]:>10.3f} {times[1]:>10.3f} {times[0] / times[1]:>9.1f}x")
+
+    batch = MatrixGenerator(25, 25, rng=rng).generate_batch(batch_k)
+    t_numpy, _ = _timeit(algo.Heuristics_Batch, batch, 12, "numpy")
+    t_numba, _ = _timeit(algo.Heuristics_Batch, batch, 12, "numba")
+    print(f"{'пакет эвристик':>16} {25:>5} {t_numpy / batch_k * 1e3:>10.4f} {t_numba / batch_k * 1e3:>10.4f} "
+          f"{t_numpy / t_numba:>9.1f}x  (на матрицу, k={batch_k})")
+
+
+def check_dtype(k=20000, n=25, rtol=1e-5, seed=0):
+    """Сравнение float32 и float64 на одних и тех же матрицах.
+
+    float32-пакет получается округлением тех же случайных чисел, поэтому
+    итоги сравниваются поэкземплярно. При почти равных значениях в столбце
+    округление может изменить отдельный выбор эвристики, поэтому допуск rtol
+    проверяется для средних итогов (то, что выводит эксперимент); доля
+    экземпляров с другим выбором выводится отдельно.
+    """
+    x = n // 2
+    heuristics = {
+        "Greedy": lambda batch: algo.Greedy_Batch(batch)[0],
+        "Thrifty": lambda batch: algo.Thrifty_Batch(batch)[0],
+        "Greedy-Thrifty": lambda batch: algo.Greedy_Thrifty_Batch(batch, x)[0],
+        "Thrifty-Greedy": lambda batch: algo.Thrifty_Greedy_Batch(batch, x)[0],
+    }
+    batches = {}
+    for dtype in ("float64", "float32"):
+        gen = MatrixGenerator(n, n, "concentrated", rng=np.random.default_rng(seed), dtype=dtype)
+        t_gen, batches[dtype] = _timeit(gen.generate_batch, k)
+        t_run, _ = _timeit(lambda: [run(batches[dtype]) for run in heuristics.values()])
+        print(f"{dtype:>8}: {batches[dtype].nbytes / 2**20:7.1f} МБ, генерация {t_gen:.2f} с, эвристики {t_run:.2f} с")
+
+    exact = {"Munkres-Max": lambda batch: np.array([algo(matrix).Munkres_Alg_Max()[0] for matrix in batch[:1000]])}
+    for name, run in {**heuristics, **exact}.items():
+        reference = run(batches["float64"])
+        compact = run(batches["float32"]).astype(np.float64)
+        error = np.abs(compact - reference) / reference
+        mean_error = abs(compact.mean() / reference.mean() - 1)
+        print(f"{name:>15}: расхождение среднего {mean_error:.2e}, макс. поэкземплярное {error.max():.2e}, "
+              f"другой выбор в {np.mean(error > 1e-6) * 100:.2f}% экземпляров")
+        if mean_error > rtol:
+            raise RuntimeError(f"float32 расходится с float64 для {name}: {mean_error:.2e} > {rtol}")
+
+
+def _legacy_generate(n, v, distribution_type, a_min=0.12, a_max=0.2, beta_min=0.93, beta_max=0.98):
+    """Прежняя генерация с циклами по строкам и столбцам (эталон для сравнения)"""
+    C = np.random.uniform(a_min, a_max, (n, v))
+    if distribution_type == "uniform":
+        beta = np.random.uniform(beta_min, beta_max, (n, v))
+    else:
+        beta = np.zeros((n, v))
+        max_delta = (beta_max - beta_min) / 4
+        for i in range(n):
+            delta_i = np.random.uniform(0, max_delta)
+            beta1_i = np.random.uniform(beta_min, beta_max - delta_i)
+            beta[i] = np.random.uniform(beta1_i, beta1_i + delta_i, v)
+    for j in range(1, v):
+        C[:, j] = C[:, j-1] * beta[:, j-1]
+    return C
+
+
+def bench_generation(n=1000, k=20000, small=25):
+    """Генерация матриц: циклы против векторизованной версии"""
+    for dist in ("uniform", "concentrated"):
+        t_old, _ = _timeit(_legacy_generate, n, n, dist, repeat=3)
+        t_new, _ = _timeit(MatrixGenerator, n, n, dist, repeat=3)
+        print(f"{dist:>12} {n}x{n}: циклы {t_old:.4f} с, векторно {t_new:.4f} с, "
+              f"ускорение {t_old / t_new:.1f}x")
+
+        start = time.perf_counter()
+        for _ in range(k):
+            _legacy_generate(small, small, dist)
+        t_old = time.perf_counter() - start
+        t_new, _ = _timeit(MatrixGenerator(small, small, dist).generate_batch, k)
+        print(f"{dist:>12} {k} x {small}x{small}: циклы {t_old:.2f} с, пакетно {t_new:.2f} с, "
+              f"ускорение {t_old / t_new:.0f}x")
+
+
+def bench_histogram(series=300, points=26, frames=120):
+    """Перерисовка HistogramWidget: новые данные против кэшированного изображения"""
+    import os
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    from gui import HistogramWidget
+
+    app = QApplication.instance() or QApplication([])
+    widget = HistogramWidget()
+    widget.resize(1000, 700)
+    widget.show()
+    app.processEvents()
+    rng = np.random.default_rng(0)
+    curves = {f"x{i}": rng.random(points).cumsum() for i in range(series)}
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        widget.update_curves(curves)
+        widget.repaint()
+    t_fresh = (time.perf_counter() - start) / frames
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        widget.repaint()
+    t_cached = (time.perf_counter() - start) / frames
+
+    print(f"{series} серий x {points} точек: новые данные {t_fresh * 1000:.1f} мс/кадр ({1 / t_fresh:.0f} fps), "
+          f"из кэша {t_cached * 1000:.2f} мс/кадр ({1 / t_cached:.0f} fps)")
+    del app
+
+
+def bench_import_time(targets=("matgen", "runner", "assignment", "gui")):
+    """Время импорта модулей по данным python -X importtime (холодный процесс)"""
+    for target in targets:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+            capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            print(f"{target:>12}: не импортируется ({proc.stderr.strip().splitlines()[-1]})")
+            continue
+        # Последняя строка importtime - сам модуль: "import time: self | cumulative | name"
+        cumulative = int(proc.stderr.strip().splitlines()[-1].split("|")[1])
+        loaded = [line.split("|")[2].strip() for line in proc.stderr.splitlines()[1:]]
+        heavy = [name for name in ("numpy", "munkres", "PySide6", "concurrent.futures") if name in loaded]
+        print(f"{target:>12}: {cumulative / 1000:7.1f} мс, загружены: {', '.join(heavy) or '-'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарки решателей")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[15, 100, 500, 2000])
+    parser.add_argument("--munkres-limit", type=int, default=500,
+                        help="максимальный размер, для которого запускается munkres")
+    parser.add_argument("--batch", type=int, default=100000,
+                        help="число матриц 25x25 в пакетном бенчмарке")
+    args = parser.parse_args()
+
+    bench_import_time()
+    bench_generation()
+    bench_solvers(args.sizes, args.munkres_limit)
+    bench_batch(args.batch)
+    bench_incremental()
+    bench_sweep()
+    bench_warm_start()
+    bench_topk()
+    bench_auction()
+    check_dtype()
+    check_backends()
+    bench_backends()
+    try:
+        bench_histogram()
+    except ImportError as e:
+        print(f"HistogramWidget: пропущено ({e})")
@@ -1,11 +1,10 @@
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, 
-                              QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QStackedWidget, QLineEdit, QRadioButton, QGroupBox, QScrollArea, QSpinBox, QGridLayout, QSizePolicy, QTextEdit, QTabWidget)
-from PySide6.QtCore import Qt
-from PySide6.QtGui import (QIntValidator, QDoubleValidator, QPixmap, QPalette, QPainter, QPen, QColor, QFont, QIcon)
-from matgen import *
+                              QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QStackedWidget, QLineEdit, QRadioButton, QGroupBox, QSpinBox, QGridLayout, QSizePolicy, QTextEdit, QTabWidget, QCheckBox, QTableView, QFileDialog, QStyledItemDelegate)
+from PySide6.QtCore import Qt, QObject, QThread, Signal, QAbstractTableModel, QModelIndex, QPointF, QRegularExpression
+from PySide6.QtGui import (QIntValidator, QDoubleValidator, QRegularExpressionValidator, QPixmap, QPalette, QPainter, QPen, QColor, QFont, QIcon, QPolygonF)
+import math
 import sys
 import os
-import numpy as np
 
 def resource_path(relative_path):
     try:
@@ -15,41 +14,202 @@ def resource_path(relative_path):
 
     return os.path.join(base_path, relative_path)
 
+def load_matrix(path):
+    """Читает матрицу из .npy или CSV (разделитель ',' или ';' с десятичной запятой)"""
+    import numpy as np
+    if path.lower().endswith(".npy"):
+        matrix = np.load(path)
+    else:
+        with open(path, encoding="utf-8-sig") as f:
+            text = f.read()
+        delimiter = ","
+        if ";" in text:
+            # CSV из Excel в русской локали: ';' между числами, ',' в дробях
+            text = text.replace(",", ".")
+            delimiter = ";"
+        matrix = np.loadtxt(text.splitlines(), delimiter=delimiter, ndmin=2)
+
+    if matrix.ndim != 2 or matrix.size == 0:
+        raise ValueError("Файл должен содержать непустую двумерную матрицу")
+    if not np.issubdtype(matrix.dtype, np.number) or not np.isfinite(matrix).all():
+        raise ValueError("Матрица должна содержать только конечные числа")
+    return matrix.astype(np.float64, copy=False)
+
+class MatrixTableModel(QAbstractTableModel):
+    """Редактируемая матрица NumPy для QTableView.
+
+    Значения хранятся в буфере с запасом, матрица - его срез. Правка ячейки
+    пишет прямо в массив, изменение размера меняет только размеры модели,
+    а представление отрисовывает лишь видимые ячейки.
+    """
+    def __init__(self, rows=0, columns=0, parent=None):
+        super().__init__(parent)
+        import numpy as np
+        self._buffer = np.zeros((rows, columns))
+        self._rows = rows
+        self._columns = columns
+
+    def matrix(self):
+        """Текущая матрица (срез буфера, без копирования)"""
+        return self._buffer[:self._rows, :self._columns]
+
+    def set_matrix(self, matrix):
+        import numpy as np
+        self.beginResetModel()
+        self._buffer = np.array(matrix, dtype=np.float64)
+        self._rows, self._columns = self._buffer.shape
+        self.endResetModel()
+
+    def fill(self, value=0.0):
+        self._buffer[:self._rows, :self._columns] = value
+        if self._rows and self._columns:
+            self.dataChanged.emit(self.index(0, 0), self.index(self._rows - 1, self._columns - 1))
+
+    def resize(self, rows, columns):
+        """Новые ячейки нулевые, значения в пересечении сохраняются"""
+        import numpy as np
+        capacity_rows, capacity_columns = self._buffer.shape
+        if rows > capacity_rows or columns > capacity_columns:
+            # Запас вдвое: при постепенном увеличении буфер копируется редко
+            buffer = np.zeros((max(rows, 2 * capacity_rows), max(columns, 2 * capacity_columns)))
+            buffer[:self._rows, :self._columns] = self.matrix()
+            self._buffer = buffer
+
+        if rows < self._rows:
+            self.beginRemoveRows(QModelIndex(), rows, self._rows - 1)
+            self._buffer[rows:self._rows, :self._columns] = 0.0
+            self._rows = rows
+            self.endRemoveRows()
+        if columns < self._columns:
+            self.beginRemoveColumns(QModelIndex(), columns, self._columns - 1)
+            self._buffer[:self._rows, columns:self._columns] = 0.0
+            self._columns = columns
+            self.endRemoveColumns()
+        if rows > self._rows:
+            self.beginInsertRows(QModelIndex(), self._rows, rows - 1)
+            self._rows = rows
+            self.endInsertRows()
+        if columns > self._columns:
+            self.beginInsertColumns(QModelIndex(), self._columns, columns - 1)
+            self._columns = columns
+            self.endInsertColumns()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._columns
+
+    def flags(self, index):
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return f"{self._buffer[index.row(), index.column()]:g}"
+        if role == Qt.EditRole and index.isValid():
+            # Полное значение: правка загруженной ячейки не округляет его до 6 знаков
+            return float(self._buffer[index.row(), index.column()])
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        try:
+            # Заменяем запятую на точку для корректного парсинга
+            number = float(str(value).replace(',', '.')) if str(value) else 0.0
+        except ValueError:
+            return False
+        # Допустимо то же, что в load_matrix: любое конечное число
+        if not math.isfinite(number):
+            return False
+        self._buffer[index.row(), index.column()] = number
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            return str(section + 1)
+        return None
+
+class MatrixCellDelegate(QStyledItemDelegate):
+    """Редактор ячейки: поле ввода числа в том виде, в каком его разбирает setData"""
+    # Знак, дробь через точку или запятую, экспонента; без ограничения знаков
+    NUMBER = QRegularExpression(r"-?\d*([.,]\d*)?([eE][-+]?\d*)?")
+
+    def createEditor(self, parent, option, index):
+        editor = QLineEdit(parent)
+        editor.setAlignment(Qt.AlignCenter)
+        editor.setValidator(QRegularExpressionValidator(self.NUMBER, editor))
+        return editor
+
 # ================== ДОБАВЛЕН КЛАСС ДЛЯ ГИСТОГРАММЫ ==================
 class HistogramWidget(QWidget):
     """Виджет для отображения гистограммы"""
     def __init__(self, parent=None):
         super().__init__(parent)
         self.results = {}
+        self.curves = {}
         self.zoom_factor = 1.0  # Фактор зума (1.0 = без зума, больше = больше зум)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.setMinimumSize(500, 400)
         self.setStyleSheet("border: 1px solid #ccc; background-color: white;")
+        # Готовое изображение графика: перерисовывается только при изменении
+        # данных, зума или размера, остальные paintEvent копируют его
+        self._cache = None
         
+    def invalidate(self):
+        self._cache = None
+        # Несколько вызовов update() до следующего кадра объединяются Qt в одну перерисовку
+        self.update()
+
     def update_results(self, results):
         self.results = results
-        self.update()
+        self.invalidate()
+
+    def update_curves(self, curves):
+        """Режим графика: {название: значения по точкам переключения x = 0..v}"""
+        self.curves = {name: [float(value) for value in values] for name, values in curves.items()}
+        self.invalidate()
     
     def zoom_in(self):
         """Увеличивает зум (уменьшает диапазон отображения)"""
         self.zoom_factor = min(self.zoom_factor * 1.5, 10.0)
-        self.update()
+        self.invalidate()
     
     def zoom_out(self):
         """Уменьшает зум (увеличивает диапазон отображения)"""
         self.zoom_factor = max(self.zoom_factor / 1.5, 1.0)
-        self.update()
+        self.invalidate()
     
     def reset_zoom(self):
         """Сбрасывает зум к исходному состоянию"""
         self.zoom_factor = 1.0
-        self.update()
-        
+        self.invalidate()
+
     def paintEvent(self, event):
+        if self.width() <= 0 or self.height() <= 0:
+            return
+        ratio = self.devicePixelRatioF()
+        if self._cache is None or self._cache.size() != self.size() * ratio:
+            self._cache = QPixmap(self.size() * ratio)
+            self._cache.setDevicePixelRatio(ratio)
+            cache_painter = QPainter(self._cache)
+            self.paint_plot(cache_painter)
+            cache_painter.end()
+
         painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._cache)
+
+    def paint_plot(self, painter):
         painter.setRenderHint(QPainter.Antialiasing)
         
         painter.fillRect(self.rect(), Qt.white)
+
+        if self.curves:
+            self.paint_curves(painter)
+            return
         
         if not self.results:
             painter.setPen(QColor(100, 100, 100))
@@ -148,6 +308,11 @@ class HistogramWidget(QWidget):
             QColor(255, 165, 0)     # Оранжевый
         ]
         
+        # При большом числе столбцов подписи не помещаются и не рисуются
+        font = QFont("Comic Sans MS", 20, QFont.Bold)
+        painter.setFont(font)
+        show_labels = bar_width >= painter.fontMetrics().horizontalAdvance("0.000")
+
         for i, (strategy, value) in enumerate(self.results.items()):
             if display_min == 0:
                 normalized_height = value / display_max
@@ -166,6 +331,8 @@ class HistogramWidget(QWidget):
             painter.setBrush(color)
             painter.setPen(QPen(darker_color, 1))
             painter.drawRect(int(x), int(y), int(bar_width), int(bar_height))
+            if not show_labels:
+                continue
             
             # Подпись значения
             painter.setPen(Qt.black)
@@ -192,13 +359,181 @@ class HistogramWidget(QWidget):
                 line_width = painter.fontMetrics().horizontalAdvance(line)
                 painter.drawText(int(x + bar_width/2 - line_width/2),
                                int(plot_y + plot_height + 20 + j*15), line)
+
+    def paint_curves(self, painter):
+        """Рисует ломаные итогов гибридных стратегий по точке переключения"""
+        margin = 80
+        plot_width = self.width() - 2 * margin
+        plot_height = self.height() - 2 * margin
+        plot_x = margin
+        plot_y = margin
+
+        if plot_width <= 0 or plot_height <= 0:
+            return
+
+        all_values = [value for values in self.curves.values() for value in values]
+        min_val = min(all_values)
+        max_val = max(all_values)
+        padding = (max_val - min_val) * 0.05 / self.zoom_factor or 0.1
+        display_min = min_val - padding
+        display_range = max_val - min_val + 2 * padding
+        num_points = max(len(values) for values in self.curves.values())
+
+        # Оси
+        painter.setPen(QPen(Qt.black, 2))
+        painter.drawLine(plot_x, plot_y, plot_x, plot_y + plot_height)
+        painter.drawLine(plot_x, plot_y + plot_height, plot_x + plot_width, plot_y + plot_height)
+
+        # Сетка и подписи значений
+        num_grid_lines = 5
+        font = QFont("Comic Sans MS", 13)
+        painter.setFont(font)
+        for i in range(num_grid_lines + 1):
+            y = plot_y + plot_height - (i * plot_height / num_grid_lines)
+            painter.setPen(QPen(QColor(200, 200, 200), 1))
+            painter.drawLine(plot_x, int(y), plot_x + plot_width, int(y))
+
+            value_text = f"{display_min + i * display_range / num_grid_lines:.3f}"
+            painter.setPen(Qt.black)
+            text_width = painter.fontMetrics().horizontalAdvance(value_text)
+            painter.drawText(plot_x - text_width - 10, int(y + 5), value_text)
+
+        # Подписи точек переключения
+        step = max(1, num_points // 10)
+        for x in range(0, num_points, step):
+            px = plot_x + x * plot_width / max(1, num_points - 1)
+            painter.drawText(int(px - 5), plot_y + plot_height + 20, str(x))
+        painter.drawText(plot_x + plot_width // 2 - 100, plot_y + plot_height + 50, "Точка переключения x")
+
+        colors = [QColor(50, 205, 50), QColor(138, 43, 226), QColor(255, 99, 71), QColor(30, 144, 255)]
+        many = len(self.curves) > len(colors)
+        x_scale = plot_width / max(1, num_points - 1)
+        y_scale = plot_height / display_range
+        for i, (name, values) in enumerate(self.curves.items()):
+            # Для сотен серий (ячейки сетки, точки переключения) - тонкие линии по кругу оттенков
+            if many:
+                color = QColor.fromHsvF(i / len(self.curves), 0.8, 0.8)
+                painter.setPen(QPen(color, 1))
+            else:
+                color = colors[i]
+                painter.setPen(QPen(color, 3))
+            # Одна ломаная на серию вместо отдельного drawLine на каждый отрезок
+            painter.drawPolyline(QPolygonF([
+                QPointF(plot_x + x * x_scale, plot_y + plot_height - (value - display_min) * y_scale)
+                for x, value in enumerate(values)
+            ]))
+
+            # Легенда и лучшая точка переключения (только для нескольких серий)
+            if not many:
+                best = max(range(len(values)), key=values.__getitem__)
+                painter.drawText(plot_x + 20, plot_y - 40 + i * 25, f"{name}: максимум {values[best]:.3f} при x = {best}")
+        if many:
+            painter.setPen(Qt.black)
+            painter.drawText(plot_x + 20, plot_y - 40, f"Серий: {len(self.curves)}")
 # ================== КОНЕЦ КЛАССА ДЛЯ ГИСТОГРАММЫ ==================
 
+class ExperimentWorker(QObject):
+    """Выполняет эксперимент в отдельном потоке и сообщает о прогрессе каждые report_every матриц"""
+    progress = Signal(int, int, object)
+    finished = Signal(int, object, object)
+    failed = Signal(str)
+
+    def __init__(self, number_of_experiments, params, report_every=20, adaptive=False, min_experiments=200, sweep=False):
+        super().__init__()
+        self.number_of_experiments = number_of_experiments
+        self.params = params
+        self.report_every = report_every
+        # Итоги по всем точкам переключения нужны только вкладке "Точка переключения"
+        self.sweep = sweep
+        # В адаптивном режиме number_of_experiments - верхняя граница
+        self.adaptive = adaptive
+        self.min_experiments = min_experiments
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            from runner import HEURISTICS, iter_experiments
+            from stats import difference_stats, experiment_stats, merge_stats, ranking_check
+
+            sums = {}
+            stats = {}
+            differences = {}
+            done = 0
+            looks = 0
+            chunks = iter_experiments(
+                self.number_of_experiments,
+                workers=1,
+                chunk_size=self.report_every,
+                sweep=self.sweep,
+                **self.params
+            )
+            for chunk in chunks:
+                for name, totals in chunk.items():
+                    sums[name] = sums.get(name, 0.0) + totals.sum(axis=0)
+                merge_stats(stats, experiment_stats(chunk))
+                done += len(chunk["Greedy"])
+                self.progress.emit(done, self.number_of_experiments, dict(sums))
+                if self._cancelled:
+                    break
+                if self.adaptive:
+                    merge_stats(differences, difference_stats(chunk, HEURISTICS))
+                    # Как в runner.run_adaptive: номер проверки поправляет уровень интервалов
+                    if done >= self.min_experiments:
+                        looks += 1
+                        settled, *_ = ranking_check(stats, differences, HEURISTICS, look=looks)
+                        if settled:
+                            break
+            self.finished.emit(done, sums, stats)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+class SolveWorker(QObject):
+    """Решает одну матрицу всеми стратегиями в отдельном потоке.
+
+    Если передан algo предыдущего расчета той же формы, решение
+    пересчитывается только по измененным ячейкам (algo.update).
+    Аукцион считается заново при каждом расчете, поэтому только по запросу.
+    """
+    finished = Signal(object, object, object)
+    failed = Signal(str)
+
+    def __init__(self, matrix, previous=None, auction=False):
+        super().__init__()
+        self.matrix = matrix
+        self.algo = previous
+        self.auction = auction
+
+    def run(self):
+        try:
+            from matgen import algo
+            if self.algo is not None and self.algo._params.shape == self.matrix.shape:
+                self.algo.update(self.matrix)
+            else:
+                self.algo = algo(self.matrix, incremental=True)
+            a = self.algo
+            totals = {key: a.solve(key)[0] for key in algo.STRATEGIES}
+            auction_bound = None
+            if self.auction:
+                totals['Auction'], _ = a.Auction()
+                auction_bound = a.auction_bound()
+            self.finished.emit(self.matrix.shape, totals, auction_bound)
+        except Exception as e:
+            self.failed.emit(f"{type(e).__name__}: {str(e)}")
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Система поддержки принятия решений")
         self.setGeometry(100, 100, 800, 600)
+        self.experiment_worker = None
+        self.solve_worker = None
+        self.experiment_thread = None
+        self.solve_thread = None
+        # algo последнего расчета ручного режима: правки пересчитываются инкрементально
+        self.manual_algo = None
 
         # Создаем StackedWidget как центральный виджет
         self.stacked_widget = QStackedWidget()
@@ -341,8 +676,12 @@ class MainWindow(QMainWindow):
         btn_next = QPushButton("Далее →")
         btn_next.clicked.connect(lambda: self.go_to_page(2))
         
-        self.line_button = QPushButton("Получить результаты", self)
-        self.line_button.clicked.connect(self.get_integer_from_line_edit_and_matrix)
+        # Кнопка ручного режима (line_button занята страницей экспериментов)
+        self.manual_button = QPushButton("Получить результаты", self)
+        self.manual_button.clicked.connect(self.get_integer_from_line_edit_and_matrix)
+
+        # Аукцион не пересчитывается по правкам: на больших матрицах заметно дольше
+        self.auction_checkbox = QCheckBox("Также решить аукционом (приближенно)", self)
 
         # === ДОБАВЛЕНА МАТРИЦА ===
         matrix_group = QGroupBox("Матрица")
@@ -353,7 +692,8 @@ class MainWindow(QMainWindow):
         size_layout.addWidget(QLabel("Размер:"))
         
         self.matrix_size_spin = QSpinBox()
-        self.matrix_size_spin.setRange(2, 16)
+        # Ячейки не создаются виджетами, поэтому размер ограничен только памятью
+        self.matrix_size_spin.setRange(2, 5000)
         self.matrix_size_spin.setValue(3)
         self.matrix_size_spin.valueChanged.connect(self.update_matrix_display)
         size_layout.addWidget(self.matrix_size_spin)
@@ -362,47 +702,29 @@ class MainWindow(QMainWindow):
         self.clear_matrix_button = QPushButton("Очистить матрицу")
         self.clear_matrix_button.clicked.connect(self.clear_matrix)
         size_layout.addWidget(self.clear_matrix_button)
+
+        # Загрузка большой матрицы из файла (CSV, NPY)
+        self.import_matrix_button = QPushButton("Загрузить из файла")
+        self.import_matrix_button.clicked.connect(self.import_matrix)
+        size_layout.addWidget(self.import_matrix_button)
         
         size_layout.addStretch()
         matrix_layout.addLayout(size_layout)
-        
-        # Контейнер для матрицы
-        self.matrix_container = QWidget()
-        self.matrix_grid_layout = QGridLayout(self.matrix_container)
-        self.matrix_grid_layout.setSpacing(2)  # Уменьшено расстояние между ячейками
-        self.matrix_grid_layout.setContentsMargins(5, 5, 5, 5)
-        
-        # Обертка для центрирования матрицы
-        self.matrix_wrapper = QWidget()
-        wrapper_layout = QVBoxLayout(self.matrix_wrapper)
-        wrapper_layout.setContentsMargins(0, 0, 0, 0)
-        wrapper_layout.addStretch()
-        
-        # Горизонтальный layout для центрирования по горизонтали
-        h_layout = QHBoxLayout()
-        h_layout.addStretch()
-        h_layout.addWidget(self.matrix_container)
-        h_layout.addStretch()
-        
-        h_widget = QWidget()
-        h_widget.setLayout(h_layout)
-        wrapper_layout.addWidget(h_widget)
-        wrapper_layout.addStretch()
-        
-        # Прокрутка для матрицы
-        self.matrix_scroll_area = QScrollArea()
-        self.matrix_scroll_area.setWidgetResizable(True)
-        self.matrix_scroll_area.setWidget(self.matrix_wrapper)
-        self.matrix_scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        self.matrix_scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        # Устанавливаем минимальную высоту, которая будет динамически обновляться
-        self.matrix_scroll_area.setMinimumHeight(200)
-        
-        matrix_layout.addWidget(self.matrix_scroll_area, stretch=1)
-        
-        # Инициализация матрицы
-        self.matrix_inputs = []
-        self.create_matrix_inputs(3)
+
+        self.imported_label = QLabel()
+        self.imported_label.hide()
+        matrix_layout.addWidget(self.imported_label)
+
+        # Матрица хранится в NumPy-модели, QTableView отрисовывает только видимые ячейки
+        self.matrix_model = MatrixTableModel(3, 3, parent=self)
+        self.matrix_view = QTableView()
+        self.matrix_view.setModel(self.matrix_model)
+        self.matrix_view.setItemDelegate(MatrixCellDelegate(self.matrix_view))
+        self.matrix_view.horizontalHeader().setDefaultSectionSize(70)
+        self.matrix_view.verticalHeader().setDefaultSectionSize(30)
+        self.matrix_view.setStyleSheet("QHeaderView::section { background-color: #ffbdbd; padding: 2px; }")
+        self.matrix_view.setMinimumHeight(200)
+        matrix_layout.addWidget(self.matrix_view, stretch=1)
         
         matrix_group.setLayout(matrix_layout)
         # === КОНЕЦ МАТРИЦЫ ===
@@ -437,7 +759,8 @@ class MainWindow(QMainWindow):
         optionsLayout.addWidget(title)
         #optionsLayout.addWidget(QLabel("Это страница ручного режима"))
         optionsLayout.addWidget(matrix_group)  # Добавляем матрицу
-        optionsLayout.addWidget(self.line_button)
+        optionsLayout.addWidget(self.auction_checkbox)
+        optionsLayout.addWidget(self.manual_button)
         #optionsLayout.addStretch(1)
         optionsLayout.addWidget(self.textOutput)
         #optionsLayout.addStretch()
@@ -455,231 +778,162 @@ class MainWindow(QMainWindow):
         self.stacked_widget.addWidget(page)
         
         # Методы для работы с матрицей
-    def create_matrix_inputs(self, size):
-        """Создает поля ввода для матрицы указанного размера с индексами"""
-        # Очищаем старые поля
-        for i in reversed(range(self.matrix_grid_layout.count())):
-            widget = self.matrix_grid_layout.itemAt(i).widget()
-            if widget:
-                widget.deleteLater()
-        
-        self.matrix_inputs.clear()
-        
-        # Размеры ячеек (в пикселях)
-        CELL_WIDTH = 70
-        CELL_HEIGHT = 30
-        HEADER_COL_WIDTH = CELL_WIDTH  # Заголовки столбцов должны быть такой же ширины, как ячейки
-        HEADER_ROW_WIDTH = 80
-        HEADER_HEIGHT = 30
-        
-        # Сбрасываем все растягивания - используем фиксированные размеры
-        for i in range(self.matrix_grid_layout.columnCount()):
-            self.matrix_grid_layout.setColumnStretch(i, 0)
-            self.matrix_grid_layout.setColumnMinimumWidth(i, 0)
-        for i in range(self.matrix_grid_layout.rowCount()):
-            self.matrix_grid_layout.setRowStretch(i, 0)
-            self.matrix_grid_layout.setRowMinimumHeight(i, 0)
-        
-        # Устанавливаем размеры для заголовка строк (столбец 0)
-        self.matrix_grid_layout.setColumnMinimumWidth(0, HEADER_ROW_WIDTH)
-        
-        # Создаем заголовки столбцов (сверху)
-        for j in range(size):
-            label_col = QLabel(f"{j+1}")
-            label_col.setAlignment(Qt.AlignCenter)
-            label_col.setStyleSheet("background-color: #ffbdbd; padding: 2px;") #e0e0e0
-            label_col.setFixedSize(HEADER_COL_WIDTH, HEADER_HEIGHT)
-            label_col.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-            self.matrix_grid_layout.addWidget(label_col, 0, j+1, alignment=Qt.AlignCenter)
-            # Устанавливаем фиксированную ширину для столбцов данных (совпадает с шириной заголовка)
-            self.matrix_grid_layout.setColumnMinimumWidth(j+1, CELL_WIDTH)
-            self.matrix_grid_layout.setColumnStretch(j+1, 0)  # Не растягиваем столбцы
-        
-        # Устанавливаем высоту для заголовка столбцов (строка 0)
-        self.matrix_grid_layout.setRowMinimumHeight(0, HEADER_HEIGHT)
-        
-        # Создаем заголовки строк (слева)
-        for i in range(size):
-            label_row = QLabel(f"{i+1}")
-            label_row.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            label_row.setStyleSheet("background-color: #ffbdbd; padding: 3px;")
-            label_row.setFixedSize(HEADER_ROW_WIDTH, CELL_HEIGHT)
-            label_row.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-            self.matrix_grid_layout.addWidget(label_row, i+1, 0)
-            # Устанавливаем минимальную высоту для строк данных
-            self.matrix_grid_layout.setRowMinimumHeight(i+1, CELL_HEIGHT)
-        
-        # Создаем поля ввода (с учетом смещения из-за заголовков)
-        for i in range(size):
-            row_inputs = []
-            for j in range(size):
-                line_edit = QLineEdit()
-                # line_edit.setStyleSheet("""
-                #     QLineEdit {
-                #         background-color: #ffc2c2;
-                #     }
-                # """)
-                #line_edit.mousePressEvent = lambda _ : line_edit.selectAll() #select text in line edit upon mouse press
-                line_edit.setFixedSize(CELL_WIDTH, CELL_HEIGHT)
-                line_edit.setAlignment(Qt.AlignCenter)
-                line_edit.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-                
-                # Валидатор для неотрицательных чисел
-                from PySide6.QtGui import QDoubleValidator
-                validator = QDoubleValidator(0, 999999.99, 2)
-                line_edit.setValidator(validator)
-                
-                # Устанавливаем значение по умолчанию
-                # if i == j:
-                #     line_edit.setText("0")
-                # else:
-                #     line_edit.setText("1")
-                line_edit.setText("")
-                
-                # Добавляем с учетом заголовков (i+1, j+1) с выравниванием по центру
-                self.matrix_grid_layout.addWidget(line_edit, i+1, j+1, alignment=Qt.AlignCenter)
-                row_inputs.append(line_edit)
-            
-            self.matrix_inputs.append(row_inputs)
-        
-        # Обновляем размер контейнера на основе размера матрицы
-        # Вычисляем общий размер матрицы
-        margins = self.matrix_grid_layout.contentsMargins()
-        total_width = HEADER_ROW_WIDTH + (size * CELL_WIDTH) + (self.matrix_grid_layout.spacing() * (size + 1)) + margins.left() + margins.right()
-        total_height = HEADER_HEIGHT + (size * CELL_HEIGHT) + (self.matrix_grid_layout.spacing() * (size + 1)) + margins.top() + margins.bottom()
-        
-        # Устанавливаем минимальный размер контейнера
-        self.matrix_container.setMinimumSize(total_width, total_height)
-        # Обновляем геометрию контейнера
-        self.matrix_container.adjustSize()
-        self.matrix_container.updateGeometry()
-
     def update_matrix_display(self):
-        """Обновляет отображение матрицы при изменении размера"""
+        """Изменяет размер матрицы, значения в пересечении сохраняются"""
         size = self.matrix_size_spin.value()
-        self.create_matrix_inputs(size)
+        self.imported_label.hide()
+        self.matrix_model.resize(size, size)
 
-    def get_matrix_data(self):
-        """Возвращает данные матрицы как numpy array"""
+    def import_matrix(self):
+        """Загружает матрицу из файла в редактор"""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Загрузить матрицу", "", "Матрицы (*.csv *.txt *.npy);;Все файлы (*)"
+        )
+        if not path:
+            return
         try:
-            import numpy as np
-            size = self.matrix_size_spin.value()
-            matrix = []
-            
-            for i in range(size):
-                row = []
-                for j in range(size):
-                    text = self.matrix_inputs[i][j].text()
-                    if text:
-                        # Заменяем запятую на точку для корректного парсинга
-                        row.append(float(text.replace(',', '.')))
-                    else:
-                        row.append(0.0)
-                matrix.append(row)
-            
-            return np.array(matrix)
-        except Exception as e:
-            print(f"Ошибка получения данных матрицы: {e}")
-            return None
+            matrix = load_matrix(path)
+        except (OSError, ValueError) as e:
+            self.textOutput.setHtml(f"<span style='color: red;'><b>Ошибка загрузки:</b> {str(e)}</span>")
+            return
+        self.show_imported_matrix(matrix, os.path.basename(path))
+
+    def show_imported_matrix(self, matrix, name):
+        self.matrix_model.set_matrix(matrix)
+        # Размер в спинбоксе без повторного изменения модели
+        self.matrix_size_spin.blockSignals(True)
+        self.matrix_size_spin.setValue(matrix.shape[0])
+        self.matrix_size_spin.blockSignals(False)
+        self.imported_label.setText(f"Загружено из {name}: {matrix.shape[0]}×{matrix.shape[1]}")
+        self.imported_label.show()
+
+    def get_matrix_data(self):
+        """Возвращает данные матрицы как numpy array (без разбора текста)"""
+        return self.matrix_model.matrix()
 
     def clear_matrix(self):
         """Зануляет все ячейки матрицы"""
-        size = self.matrix_size_spin.value()
-        for i in range(size):
-            for j in range(size):
-                if i < len(self.matrix_inputs) and j < len(self.matrix_inputs[i]):
-                    self.matrix_inputs[i][j].setText("0")
+        self.matrix_model.fill(0.0)
 
     def get_integer_from_line_edit_and_matrix(self):
-        try:
-            self.line_button.setEnabled(False)
-            self.line_button.setText("Вычисляется...")
-            
-            matrix = self.get_matrix_data()
-            if matrix is None:
-                self.textOutput.setHtml("<span style='color: red;'><b>Ошибка:</b> Не удалось получить данные матрицы</span>")
-                return
-                
-            a = algo(matrix)
-            
-            # Получаем результаты всех алгоритмов
-            munkres_min_total, _ = a.Munkres_Alg()
-            munkres_max_total, _ = a.Munkres_Alg_Max()
-            greedy_total, _ = a.Greedy()
-            thrifty_total, _ = a.Thrifty()
-            greedy_thrifty_total, _ = a.Greedy_Thrifty(matrix.shape[0]//2)
-            thrifty_greedy_total, _ = a.Thrifty_Greedy(matrix.shape[0]//2)
-            
-            # Собираем все стратегии для сравнения (без Munkres)
-            comparison_results = {
-                'Жадный (Greedy)': greedy_total,
-                'Бережливый (Thrifty)': thrifty_total,
-                'Жадно-бережливый': greedy_thrifty_total,
-                'Бережливо-жадный': thrifty_greedy_total
-            }
-            
-            # Находим лучшую и худшую стратегии (без Munkres)
-            best_strategy = max(comparison_results, key=comparison_results.get)
-            worst_strategy = min(comparison_results, key=comparison_results.get)
-            best_value = comparison_results[best_strategy]
-            worst_value = comparison_results[worst_strategy]
-            ideal_value = munkres_max_total
-            
-            # Формируем красивый HTML вывод
-            html_text = f"""
-            <h3 style="color: #2c3e50; text-align: center; margin-bottom: 15px;">Результаты расчета</h3>
-            
-            <p style="margin-bottom: 15px;"><b>Матрица:</b> {matrix.shape[0]}×{matrix.shape[1]}</p>
-            
-            <div style="margin-bottom: 15px;">
-                <h4 style="margin-bottom: 10px;">Результаты алгоритмов:</h4>
-                <div style="margin-left: 20px;">
-                    <p style="margin: 5px 0;">• <b>Венгерский (Min):</b> {munkres_min_total:.3f} ({munkres_min_total/ideal_value*100:.1f}%)</p>
-                    <p style="margin: 5px 0; background-color: #e8f4e8; padding: 3px 8px; border-radius: 3px;">
-                        • <b>Венгерский (Max) - идеал:</b> {ideal_value:.3f} (100.0%)
-                    </p>
-                    <p style="margin: 5px 0;">• <b>Жадный (Greedy):</b> {greedy_total:.3f} ({greedy_total/ideal_value*100:.1f}%)</p>
-                    <p style="margin: 5px 0;">• <b>Бережливый (Thrifty):</b> {thrifty_total:.3f} ({thrifty_total/ideal_value*100:.1f}%)</p>
-                    <p style="margin: 5px 0;">• <b>Жадно-бережливый:</b> {greedy_thrifty_total:.3f} ({greedy_thrifty_total/ideal_value*100:.1f}%)</p>
-                    <p style="margin: 5px 0;">• <b>Бережливо-жадный:</b> {thrifty_greedy_total:.3f} ({thrifty_greedy_total/ideal_value*100:.1f}%)</p>
-                </div>
-            </div>
-            
-            <div style="margin-bottom: 15px;">
-                <h4 style="margin-bottom: 10px;">Сравнение стратегий (без Munkres):</h4>
-                <div style="background-color: #d4edda; padding: 8px; border-radius: 4px; margin-bottom: 5px;">
-                    <b>Лучшая стратегия:</b> {best_strategy}<br>
-                    <b>Результат:</b> {best_value:.3f} ({best_value/ideal_value*100:.1f}% от идеала)
-                </div>
-                
-                <div style="background-color: #f8d7da; padding: 8px; border-radius: 4px; margin-bottom: 10px;">
-                    <b>Худшая стратегия:</b> {worst_strategy}<br>
-                    <b>Результат:</b> {worst_value:.3f} ({worst_value/ideal_value*100:.1f}% от идеала)
-                </div>
-                
-                <p style="margin: 5px 0;"><b>Разница:</b> {best_value - worst_value:.3f}</p>
-                <p style="margin: 5px 0;"><b>Эффективность лучшей:</b> {best_value/ideal_value*100:.1f}% от идеального алгоритма</p>
+        """Решает матрицу ручного режима в отдельном потоке"""
+        matrix = self.get_matrix_data()
+        if matrix is None:
+            self.textOutput.setHtml("<span style='color: red;'><b>Ошибка:</b> Не удалось получить данные матрицы</span>")
+            return
+
+        self.manual_button.setEnabled(False)
+        self.manual_button.setText("Вычисляется...")
+
+        self.solve_thread = QThread(self)
+        # Копия: пока идет расчет, матрицу можно редактировать
+        self.solve_worker = SolveWorker(matrix.copy(), self.manual_algo, self.auction_checkbox.isChecked())
+        # До завершения расчета algo принадлежит потоку решения
+        self.manual_algo = None
+        self.solve_worker.moveToThread(self.solve_thread)
+
+        self.solve_thread.started.connect(self.solve_worker.run)
+        self.solve_worker.finished.connect(self.show_manual_results)
+        self.solve_worker.failed.connect(self.on_solve_failed)
+        self.solve_worker.finished.connect(self.solve_thread.quit)
+        self.solve_worker.failed.connect(self.solve_thread.quit)
+        self.solve_thread.finished.connect(self.solve_worker.deleteLater)
+        self.solve_thread.finished.connect(self.solve_thread.deleteLater)
+
+        self.solve_thread.start()
+
+    def finish_solve(self):
+        self.solve_worker = None
+        self.manual_button.setEnabled(True)
+        self.manual_button.setText("Получить результаты")
+
+    def on_solve_failed(self, message):
+        self.finish_solve()
+        error_html = f"""
+        <div style="background-color: #ffebee; padding: 10px; border-radius: 4px;">
+            <b style="color: #d32f2f;">Ошибка при расчетах</b><br>
+            {message}<br>
+            Проверьте корректность данных в матрице.
+        </div>
+        """
+        self.textOutput.setHtml(error_html)
+
+    def show_manual_results(self, shape, totals, auction_bound):
+        """Выводит результаты всех стратегий для матрицы ручного режима"""
+        self.manual_algo = self.solve_worker.algo
+        self.finish_solve()
+        munkres_min_total = totals['Munkres-Min']
+        munkres_max_total = totals['Munkres-Max']
+        greedy_total = totals['Greedy']
+        thrifty_total = totals['Thrifty']
+        greedy_thrifty_total = totals['Greedy-Thrifty']
+        thrifty_greedy_total = totals['Thrifty-Greedy']
+
+        # Собираем все стратегии для сравнения (без Munkres)
+        comparison_results = {
+            'Жадный (Greedy)': greedy_total,
+            'Бережливый (Thrifty)': thrifty_total,
+            'Жадно-бережливый': greedy_thrifty_total,
+            'Бережливо-жадный': thrifty_greedy_total
+        }
+
+        # Находим лучшую и худшую стратегии (без Munkres)
+        best_strategy = max(comparison_results, key=comparison_results.get)
+        worst_strategy = min(comparison_results, key=comparison_results.get)
+        best_value = comparison_results[best_strategy]
+        worst_value = comparison_results[worst_strategy]
+        ideal_value = munkres_max_total
+
+        # Строка аукциона - только если он был запрошен
+        auction_line = ""
+        if 'Auction' in totals:
+            auction_total = totals['Auction']
+            auction_line = f"""<p style="margin: 5px 0;">• <b>Аукцион:</b> {auction_total:.3f} ({auction_total/ideal_value*100:.1f}%),
+                    отклонение от идеала не больше {auction_bound:.2e}</p>"""
+
+        # Формируем красивый HTML вывод
+        html_text = f"""
+        <h3 style="color: #2c3e50; text-align: center; margin-bottom: 15px;">Результаты расчета</h3>
+
+        <p style="margin-bottom: 15px;"><b>Матрица:</b> {shape[0]}×{shape[1]}</p>
+
+        <div style="margin-bottom: 15px;">
+            <h4 style="margin-bottom: 10px;">Результаты алгоритмов:</h4>
+            <div style="margin-left: 20px;">
+                <p style="margin: 5px 0;">• <b>Венгерский (Min):</b> {munkres_min_total:.3f} ({munkres_min_total/ideal_value*100:.1f}%)</p>
+                <p style="margin: 5px 0; background-color: #e8f4e8; padding: 3px 8px; border-radius: 3px;">
+                    • <b>Венгерский (Max) - идеал:</b> {ideal_value:.3f} (100.0%)
+                </p>
+                {auction_line}
+                <p style="margin: 5px 0;">• <b>Жадный (Greedy):</b> {greedy_total:.3f} ({greedy_total/ideal_value*100:.1f}%)</p>
+                <p style="margin: 5px 0;">• <b>Бережливый (Thrifty):</b> {thrifty_total:.3f} ({thrifty_total/ideal_value*100:.1f}%)</p>
+                <p style="margin: 5px 0;">• <b>Жадно-бережливый:</b> {greedy_thrifty_total:.3f} ({greedy_thrifty_total/ideal_value*100:.1f}%)</p>
+                <p style="margin: 5px 0;">• <b>Бережливо-жадный:</b> {thrifty_greedy_total:.3f} ({thrifty_greedy_total/ideal_value*100:.1f}%)</p>
             </div>
-            
-            <div style="background-color: #e3f2fd; padding: 8px; border-radius: 4px;">
-                <b>Рекомендация:</b> Используйте стратегию <b>{best_strategy}</b>
+        </div>
+
+        <div style="margin-bottom: 15px;">
+            <h4 style="margin-bottom: 10px;">Сравнение стратегий (без Munkres):</h4>
+            <div style="background-color: #d4edda; padding: 8px; border-radius: 4px; margin-bottom: 5px;">
+                <b>Лучшая стратегия:</b> {best_strategy}<br>
+                <b>Результат:</b> {best_value:.3f} ({best_value/ideal_value*100:.1f}% от идеала)
             </div>
-            """
-            
-            self.textOutput.setHtml(html_text)
-            
-        except Exception as e:
-            error_html = f"""
-            <div style="background-color: #ffebee; padding: 10px; border-radius: 4px;">
-                <b style="color: #d32f2f;">Ошибка при расчетах</b><br>
-                {type(e).__name__}: {str(e)}<br>
-                Проверьте корректность данных в матрице.
+
+            <div style="background-color: #f8d7da; padding: 8px; border-radius: 4px; margin-bottom: 10px;">
+                <b>Худшая стратегия:</b> {worst_strategy}<br>
+                <b>Результат:</b> {worst_value:.3f} ({worst_value/ideal_value*100:.1f}% от идеала)
             </div>
-            """
-            self.textOutput.setHtml(error_html)
-        finally:
-            self.line_button.setEnabled(True)
-            self.line_button.setText("Получить результаты")
+
+            <p style="margin: 5px 0;"><b>Разница:</b> {best_value - worst_value:.3f}</p>
+            <p style="margin: 5px 0;"><b>Эффективность лучшей:</b> {best_value/ideal_value*100:.1f}% от идеального алгоритма</p>
+        </div>
+
+        <div style="background-color: #e3f2fd; padding: 8px; border-radius: 4px;">
+            <b>Рекомендация:</b> Используйте стратегию <b>{best_strategy}</b>
+        </div>
+        """
+
+        self.textOutput.setHtml(html_text)
 
     def create_third_page(self):
         """Третья страница"""
@@ -704,7 +958,13 @@ class MainWindow(QMainWindow):
         self.number_of_experminets = QLineEdit("100", self)
         self.number_of_experminets.setPlaceholderText("Введите число экспериментов")
         self.number_of_experminets.setStyleSheet("padding-left: 8px;")
-        self.number_of_experminets.setValidator(QIntValidator(0, 100, self))
+        self.number_of_experminets.setValidator(QIntValidator(0, 1000000, self))
+
+        # Адаптивный режим: число экспериментов становится верхней границей
+        self.adaptive_checkbox = QCheckBox("Остановиться, когда лучшая стратегия определена", self)
+
+        # Итоги гибридов по всем точкам переключения (вкладка "Точка переключения") - дольше
+        self.sweep_checkbox = QCheckBox("Считать все точки переключения", self)
 
         # Размер матрицы
         self.matrix_size = QLineEdit("15", self)
@@ -712,6 +972,12 @@ class MainWindow(QMainWindow):
         self.matrix_size.setStyleSheet("padding-left: 8px;")
         self.matrix_size.setValidator(QIntValidator(1, 25, self))
 
+        # Число этапов (столбцов), пусто - матрица квадратная
+        self.stages_count = QLineEdit("", self)
+        self.stages_count.setPlaceholderText("По умолчанию равно размеру матрицы")
+        self.stages_count.setStyleSheet("padding-left: 8px;")
+        self.stages_count.setValidator(QIntValidator(1, 25, self))
+
         # Создаем компактный layout для alpha и beta
         alpha_beta_group = QGroupBox("Параметры")
         #alpha_beta_group.setStyleSheet("font-weight: bold;")
@@ -854,6 +1120,10 @@ class MainWindow(QMainWindow):
 
         self.line_button = QPushButton("Получить результаты", self)
         self.line_button.clicked.connect(self.run_experiment)  # Изменено на run_experiment для вывода в GUI
+
+        self.cancel_button = QPushButton("Отмена", self)
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_experiment)
         
         # Текстовое поле для результатов слева (новая функция из test.py)
         self.results_text_left = QTextEdit()
@@ -869,11 +1139,15 @@ class MainWindow(QMainWindow):
         exp_label = QLabel("Количество экспериментов:")
         optionsLayout.addWidget(exp_label)
         optionsLayout.addWidget(self.number_of_experminets)
+        optionsLayout.addWidget(self.adaptive_checkbox)
+        optionsLayout.addWidget(self.sweep_checkbox)
 
                 # Размер матрицы
         size_label = QLabel("Размер матрицы:")
         optionsLayout.addWidget(size_label)
         optionsLayout.addWidget(self.matrix_size)
+        optionsLayout.addWidget(QLabel("Число этапов:"))
+        optionsLayout.addWidget(self.stages_count)
         
         # Alpha и Beta параметры
         optionsLayout.addWidget(alpha_beta_group)
@@ -881,8 +1155,11 @@ class MainWindow(QMainWindow):
         # Распределение
         optionsLayout.addWidget(gb)
         
-        # Кнопка и результат
-        optionsLayout.addWidget(self.line_button)
+        # Кнопки и результат
+        run_layout = QHBoxLayout()
+        run_layout.addWidget(self.line_button, stretch=1)
+        run_layout.addWidget(self.cancel_button)
+        optionsLayout.addLayout(run_layout)
         optionsLayout.addWidget(QLabel("Краткие результаты:"))
         optionsLayout.addWidget(self.results_text_left)
         #optionsLayout.addWidget(self.result_label)
@@ -935,9 +1212,13 @@ class MainWindow(QMainWindow):
         self.results_text_right.setPlaceholderText("Полные результаты появятся здесь после запуска эксперимента")
         results_layout.addWidget(self.results_text_right)
         
+        # Вкладка 3: Итоги гибридных стратегий по точке переключения
+        self.sweep_widget = HistogramWidget()
+
         # Добавляем вкладки
         self.tab_widget.addTab(self.histogram_tab, "Гистограмма")
         self.tab_widget.addTab(self.results_tab, "Полные результаты")
+        self.tab_widget.addTab(self.sweep_widget, "Точка переключения")
         
         right_layout.addWidget(self.tab_widget)
         # ================== КОНЕЦ ВКЛАДОК С ГРАФИКАМИ ==================
@@ -952,7 +1233,25 @@ class MainWindow(QMainWindow):
         """Переход на страницу по индексу"""
         self.stacked_widget.setCurrentIndex(index)
 
+    def closeEvent(self, event):
+        """Останавливает фоновые расчеты: поток, удаленный во время работы, завершает процесс"""
+        if self.experiment_worker is not None:
+            self.experiment_worker.cancel()
+        for thread in (self.experiment_thread, self.solve_thread):
+            try:
+                running = thread is not None and thread.isRunning()
+            except RuntimeError:
+                # Завершившийся поток уже удален через deleteLater
+                running = False
+            if running:
+                # Эксперимент остановится после текущего блока, решение матрицы - дождется конца
+                thread.quit()
+                thread.wait()
+        event.accept()
+
     def get_integer_from_line_edit(self):
+            from matgen import MatrixGenerator, algo
+
             number_of_experminets = int(self.number_of_experminets.text())
             # Заменяем запятую на точку для корректного парсинга
             alpha_min = float(self.alpha_min.text().replace(',', '.'))
@@ -1009,12 +1308,8 @@ class MainWindow(QMainWindow):
             # print(number_of_experminets, alpha_min, alpha_max, beta_min, beta_max, matrix_size)
 
     def run_experiment(self):
-        """Новый метод для запуска эксперимента с выводом результатов в GUI (из test.py)"""
+        """Запускает эксперимент в отдельном потоке, результаты выводятся по мере готовности"""
         try:
-            self.line_button.setEnabled(False)
-            self.line_button.setText("Выполняется...")
-            QApplication.processEvents()
-            
             # Получаем значения (заменяем запятую на точку для корректного парсинга)
             number_of_experiments = int(self.number_of_experminets.text())
             alpha_min = float(self.alpha_min.text().replace(',', '.'))
@@ -1022,6 +1317,7 @@ class MainWindow(QMainWindow):
             beta_min = float(self.beta_min.text().replace(',', '.'))
             beta_max = float(self.beta_max.text().replace(',', '.'))
             matrix_size = int(self.matrix_size.text())
+            stages = int(self.stages_count.text()) if self.stages_count.text() else matrix_size
             sugar = "uniform"
             if self.concentrated.isChecked():
                 sugar = "concentrated"
@@ -1029,190 +1325,277 @@ class MainWindow(QMainWindow):
                 sugar = "uniform"
 
             # Проверяем корректность
+            if number_of_experiments <= 0:
+                raise ValueError("Количество экспериментов должно быть больше 0")
             if alpha_min >= alpha_max:
                 raise ValueError("Alpha min должен быть меньше Alpha max")
             if beta_min >= beta_max:
                 raise ValueError("Beta min должен быть меньше Beta max")
-
-            sumMunkresAlg = 0
-            sumMunkresAlgMax = 0
-            sumGreedy = 0
-            sumThrifty = 0
-            sumGreedyThrifty = 0
-            sumThriftyGreedy = 0
-
-            # Запускаем эксперименты
-            for i in range(number_of_experiments):
-                thingie = MatrixGenerator(
-                    n=matrix_size, 
-                    v=matrix_size, 
-                    distribution_type=sugar, 
-                    a_min=alpha_min, 
-                    a_max=alpha_max, 
-                    beta_min=beta_min, 
-                    beta_max=beta_max
-                )
-                
-                a = algo(thingie.D_matrix)
-                
-                x, y = a.Munkres_Alg()
-                sumMunkresAlg += x
-                x, y = a.Munkres_Alg_Max()
-                sumMunkresAlgMax += x
-                x, y = a.Greedy()
-                sumGreedy += x
-                x, y = a.Thrifty()
-                sumThrifty += x
-                x, y = a.Greedy_Thrifty(matrix_size//2)
-                sumGreedyThrifty += x
-                x, y = a.Thrifty_Greedy(matrix_size//2)
-                sumThriftyGreedy += x
-            
-            # Вычисляем средние
-            # avgMunkresAlg = sumMunkresAlg / number_of_experiments
-            # avgMunkresAlgMax = sumMunkresAlgMax / number_of_experiments
-            # avgGreedy = sumGreedy / number_of_experiments
-            # avgThrifty = sumThrifty / number_of_experiments
-            # avgGreedyThrifty = sumGreedyThrifty / number_of_experiments
-            # avgThriftyGreedy = sumThriftyGreedy / number_of_experiments
-            avgMunkresAlg = sumMunkresAlg
-            avgMunkresAlgMax = sumMunkresAlgMax
-            avgGreedy = sumGreedy
-            avgThrifty = sumThrifty
-            avgGreedyThrifty = sumGreedyThrifty
-            avgThriftyGreedy = sumThriftyGreedy
-
-            if (sugar == "concentrated"):
-                if (avgGreedy > avgThrifty):
-                    avgGreedy, avgThrifty = avgThrifty, avgGreedy #swap
-            
-            if (sugar == "concentrated"):
-                if (avgGreedyThrifty > avgThriftyGreedy):
-                    avgGreedyThrifty, avgThriftyGreedy = avgThriftyGreedy, avgGreedyThrifty #swap
-            
-            # Формируем результаты для гистограммы (включая оба алгоритма Munkres)
-            results_dict = {
-                'Munkres-Min': avgMunkresAlg,
-                'Munkres-Max': avgMunkresAlgMax,
-                'Greedy': avgGreedy,
-                'Thrifty': avgThrifty,
-                'Greedy-Thrifty': avgGreedyThrifty,
-                'Thrifty-Greedy': avgThriftyGreedy
-            }
-            
-            # Обновляем гистограмму
-            self.histogram_widget.update_results(results_dict)
-            
-            # ИДЕАЛЬНОЕ ЗНАЧЕНИЕ (Munkres_Max) как 100% - ИЗМЕНЕНИЕ ЗДЕСЬ
-            ideal_value = avgMunkresAlgMax
-            
-            # НАЙТИ ЛУЧШУЮ И ХУДШУЮ СТРАТЕГИИ (БЕЗ MUNKRES)
-            # Исключаем Munkres алгоритмы из сравнения
-            comparison_results = {
-                'Greedy': avgGreedy,
-                'Thrifty': avgThrifty,
-                'Greedy-Thrifty': avgGreedyThrifty,
-                'Thrifty-Greedy': avgThriftyGreedy
-            }
-            best_strategy = max(comparison_results, key=comparison_results.get)
-            worst_strategy = min(comparison_results, key=comparison_results.get)
-            best_value = comparison_results[best_strategy]
-            worst_value = comparison_results[worst_strategy]
-            
-            # Краткие результаты слева
-            short_text = f"""
-            <h3>Краткие результаты:</h3>
-            <p><b>Идеальное значение (Munkres_Max):</b> {ideal_value:.3f}</p>
-            <p><b>Лучшая стратегия (без Munkres):</b> {best_strategy}</p>
-            <p><b>Результат:</b> {best_value:.3f} ({best_value/ideal_value*100:.1f}% от идеала)</p>
-            <p><b>Худшая стратегия (без Munkres):</b> {worst_strategy}</p>
-            <p><b>Результат:</b> {worst_value:.3f} ({worst_value/ideal_value*100:.1f}% от идеала)</p>
-            <p><b>Разница:</b> {best_value - worst_value:.3f}</p>
-            """
-            self.results_text_left.setHtml(short_text)
-            
-            # Полные результаты справа (сравниваем с ideal_value - Munkres_Max)
-            full_text = f"""
-            <h2>ПОЛНЫЕ РЕЗУЛЬТАТЫ ЭКСПЕРИМЕНТА</h2>
-            
-            <h3>Параметры эксперимента:</h3>
-            <ul>
-                <li><b>Количество экспериментов:</b> {number_of_experiments}</li>
-                <li><b>Размер матрицы:</b> {matrix_size}×{matrix_size}</li>
-                <li><b>Тип распределения:</b> {sugar}</li>
-                <li><b>Alpha диапазон:</b> {alpha_min:.3f} - {alpha_max:.3f}</li>
-                <li><b>Beta диапазон:</b> {beta_min:.3f} - {beta_max:.3f}</li>
-            </ul>
-            
-            <h3>Результаты по стратегиям:</h3>
-            <p><b>Идеальное значение (Munkres_Max):</b> {ideal_value:.3f} (100%)</p>
-            <table border="1" cellpadding="5" cellspacing="0" style="border-collapse: collapse; width: 100%;">
-                <tr style="background-color: #f2f2f2;">
-                    <th>Стратегия</th>
-                    <th>Среднее значение</th>
-                    <th>% от идеала</th>
-                </tr>
-                <tr>
-                    <td><b>Венгерский алгоритм (Munkres Min)</b></td>
-                    <td>{avgMunkresAlg:.3f}</td>
-                    <td>{avgMunkresAlg/ideal_value*100:.1f}%</td>
-                </tr>
-                <tr>
-                    <td><b>Венгерский алгоритм (Munkres Max)</b></td>
-                    <td>{avgMunkresAlgMax:.3f}</td>
-                    <td><b>100.0%</b></td>
-                </tr>
-                <tr>
-                    <td><b>Жадная стратегия (Greedy)</b></td>
-                    <td>{avgGreedy:.3f}</td>
-                    <td>{avgGreedy/ideal_value*100:.1f}%</td>
-                </tr>
-                <tr>
-                    <td><b>Бережливая стратегия (Thrifty)</b></td>
-                    <td>{avgThrifty:.3f}</td>
-                    <td>{avgThrifty/ideal_value*100:.1f}%</td>
-                </tr>
-                <tr>
-                    <td><b>Жадно-бережливая (Greedy-Thrifty)</b></td>
-                    <td>{avgGreedyThrifty:.3f}</td>
-                    <td>{avgGreedyThrifty/ideal_value*100:.1f}%</td>
-                </tr>
-                <tr>
-                    <td><b>Бережливо-жадная(Thrifty-Greedy)</b></td>
-                    <td>{avgThriftyGreedy:.3f}</td>
-                    <td>{avgThriftyGreedy/ideal_value*100:.1f}%</td>
-                </tr>
-            </table>
-            
-            <h3>Выводы (без учета алгоритмов Munkres):</h3>
-            <ul>
-                <li><b style="color: green;">✓ Лучшая стратегия:</b> {best_strategy} с результатом {best_value:.3f} ({best_value/ideal_value*100:.1f}% от идеала)</li>
-                <li><b style="color: red;">✗ Худшая стратегия:</b> {worst_strategy} с результатом {worst_value:.3f} ({worst_value/ideal_value*100:.1f}% от идеала)</li>
-                <li><b>Разница между лучшей и худшей:</b> {best_value - worst_value:.3f}</li>
-                <li><b>Эффективность лучшей стратегии:</b> {best_value/ideal_value*100:.1f}% от идеального алгоритма</li>
-            </ul>
-            
-            <h3>Рекомендации:</h3>
-            <p>Для данных параметров рекомендуется использовать стратегию <b>{best_strategy}</b>, 
-            так как она показала наилучшие результаты в {number_of_experiments} экспериментах 
-            (без учета алгоритмов Munkres) и достигает {best_value/ideal_value*100:.1f}% от идеального значения.</p>
-            """
-            self.results_text_right.setHtml(full_text)
-            
-            # Переключаемся на вкладку с гистограммой
-            self.tab_widget.setCurrentIndex(0)
-        
         except ValueError as e:
             error_text = f"<span style='color: red;'><b>Ошибка ввода данных:</b><br>{str(e)}<br>Проверьте корректность введенных значений.</span>"
             self.results_text_left.setHtml(error_text)
             self.results_text_right.setHtml(error_text)
-        except Exception as e:
-            error_text = f"<span style='color: red;'><b>Ошибка при выполнении эксперимента:</b><br>{str(e)}</span>"
-            self.results_text_left.setHtml(error_text)
-            self.results_text_right.setHtml(error_text)
-        finally:
-            self.line_button.setEnabled(True)
-            self.line_button.setText("Получить результаты")
+            return
+
+        self.experiment_params = dict(
+            number_of_experiments=number_of_experiments,
+            adaptive=self.adaptive_checkbox.isChecked(),
+            sweep=self.sweep_checkbox.isChecked(),
+            matrix_size=matrix_size,
+            stages=stages,
+            sugar=sugar,
+            alpha_min=alpha_min,
+            alpha_max=alpha_max,
+            beta_min=beta_min,
+            beta_max=beta_max,
+        )
+
+        self.line_button.setEnabled(False)
+        self.line_button.setText("Выполняется...")
+        self.cancel_button.setEnabled(True)
+
+        self.experiment_thread = QThread(self)
+        self.experiment_worker = ExperimentWorker(number_of_experiments, dict(
+            n=matrix_size,
+            v=stages,
+            distribution_type=sugar,
+            a_min=alpha_min,
+            a_max=alpha_max,
+            beta_min=beta_min,
+            beta_max=beta_max,
+        ), adaptive=self.experiment_params["adaptive"], sweep=self.experiment_params["sweep"])
+        self.experiment_worker.moveToThread(self.experiment_thread)
+
+        self.experiment_thread.started.connect(self.experiment_worker.run)
+        self.experiment_worker.progress.connect(self.on_experiment_progress)
+        self.experiment_worker.finished.connect(self.on_experiment_finished)
+        self.experiment_worker.failed.connect(self.on_experiment_failed)
+        self.experiment_worker.finished.connect(self.experiment_thread.quit)
+        self.experiment_worker.failed.connect(self.experiment_thread.quit)
+        self.experiment_thread.finished.connect(self.experiment_worker.deleteLater)
+        self.experiment_thread.finished.connect(self.experiment_thread.deleteLater)
+
+        self.experiment_thread.start()
+
+    def cancel_experiment(self):
+        """Останавливает эксперимент после текущей порции матриц"""
+        if self.experiment_worker is not None:
+            self.experiment_worker.cancel()
+            self.cancel_button.setEnabled(False)
+
+    def on_experiment_progress(self, done, total, sums):
+        self.line_button.setText(f"Выполняется... {done}/{total}")
+        sugar = self.experiment_params["sugar"]
+        self.histogram_widget.update_results(self.experiment_results_dict(sums, sugar))
+        self.sweep_widget.update_curves(self.sweep_curves(sums))
+
+    def on_experiment_finished(self, done, sums, stats):
+        self.finish_experiment()
+        if done == 0:
+            self.results_text_left.setHtml("<span style='color: red;'><b>Эксперимент отменен</b></span>")
+            return
+        self.show_experiment_results(sums, done, stats)
+        self.sweep_widget.update_curves(self.sweep_curves(sums))
+
+    def sweep_curves(self, sums):
+        """Итоги гибридных стратегий по точке переключения для графика"""
+        if 'Greedy-Thrifty sweep' not in sums:
+            return {}
+        return {
+            'Greedy-Thrifty': sums['Greedy-Thrifty sweep'],
+            'Thrifty-Greedy': sums['Thrifty-Greedy sweep'],
+        }
+
+    def on_experiment_failed(self, message):
+        self.finish_experiment()
+        error_text = f"<span style='color: red;'><b>Ошибка при выполнении эксперимента:</b><br>{message}</span>"
+        self.results_text_left.setHtml(error_text)
+        self.results_text_right.setHtml(error_text)
+
+    def finish_experiment(self):
+        self.experiment_worker = None
+        self.line_button.setEnabled(True)
+        self.line_button.setText("Получить результаты")
+        self.cancel_button.setEnabled(False)
+
+    def experiment_results_dict(self, sums, sugar):
+        """Результаты для гистограммы (включая оба алгоритма Munkres)"""
+        from runner import STRATEGIES
+        results_dict = {name: sums[name] for name in STRATEGIES}
+
+        if (sugar == "concentrated"):
+            if (results_dict['Greedy'] > results_dict['Thrifty']):
+                results_dict['Greedy'], results_dict['Thrifty'] = results_dict['Thrifty'], results_dict['Greedy'] #swap
+
+        if (sugar == "concentrated"):
+            if (results_dict['Greedy-Thrifty'] > results_dict['Thrifty-Greedy']):
+                results_dict['Greedy-Thrifty'], results_dict['Thrifty-Greedy'] = results_dict['Thrifty-Greedy'], results_dict['Greedy-Thrifty'] #swap
+
+        return results_dict
+
+    def experiment_stats_html(self, stats):
+        """Таблица потоковой статистики по отдельным экспериментам"""
+        from runner import STRATEGIES
+
+        rows = ""
+        for name in STRATEGIES:
+            total = stats[name]
+            low, high = total.confidence_interval()
+            ratio = stats.get(f"{name} / Munkres-Max")
+            ratio_text = "-" if ratio is None else f"{ratio.mean*100:.2f}% (5%: {ratio.quantile(0.05)*100:.2f}%)"
+            rows += f"""
+            <tr>
+                <td><b>{name}</b></td>
+                <td>{total.mean:.4f} ({low:.4f} - {high:.4f})</td>
+                <td>{total.std:.4f}</td>
+                <td>{total.quantile(0.05):.4f} / {total.quantile(0.5):.4f} / {total.quantile(0.95):.4f}</td>
+                <td>{ratio_text}</td>
+            </tr>"""
+
+        return f"""
+        <h3>Статистика по экспериментам:</h3>
+        <table border="1" cellpadding="5" cellspacing="0" style="border-collapse: collapse; width: 100%;">
+            <tr style="background-color: #f2f2f2;">
+                <th>Стратегия</th>
+                <th>Среднее (95% ДИ)</th>
+                <th>Ст. откл.</th>
+                <th>5% / медиана / 95%</th>
+                <th>Доля от Munkres Max</th>
+            </tr>{rows}
+        </table>
+        """
+
+    def show_experiment_results(self, sums, number_of_experiments, stats=None):
+        """Выводит итоги эксперимента в текстовые поля и гистограмму"""
+        matrix_size = self.experiment_params["matrix_size"]
+        stages = self.experiment_params["stages"]
+        sugar = self.experiment_params["sugar"]
+        alpha_min = self.experiment_params["alpha_min"]
+        alpha_max = self.experiment_params["alpha_max"]
+        beta_min = self.experiment_params["beta_min"]
+        beta_max = self.experiment_params["beta_max"]
+
+        # Вычисляем средние
+        # avgMunkresAlg = sumMunkresAlg / number_of_experiments
+        # avgMunkresAlgMax = sumMunkresAlgMax / number_of_experiments
+        # avgGreedy = sumGreedy / number_of_experiments
+        # avgThrifty = sumThrifty / number_of_experiments
+        # avgGreedyThrifty = sumGreedyThrifty / number_of_experiments
+        # avgThriftyGreedy = sumThriftyGreedy / number_of_experiments
+        results_dict = self.experiment_results_dict(sums, sugar)
+        avgMunkresAlg = results_dict['Munkres-Min']
+        avgMunkresAlgMax = results_dict['Munkres-Max']
+        avgGreedy = results_dict['Greedy']
+        avgThrifty = results_dict['Thrifty']
+        avgGreedyThrifty = results_dict['Greedy-Thrifty']
+        avgThriftyGreedy = results_dict['Thrifty-Greedy']
+        
+        # Обновляем гистограмму
+        self.histogram_widget.update_results(results_dict)
+        
+        # ИДЕАЛЬНОЕ ЗНАЧЕНИЕ (Munkres_Max) как 100% - ИЗМЕНЕНИЕ ЗДЕСЬ
+        ideal_value = avgMunkresAlgMax
+        
+        # НАЙТИ ЛУЧШУЮ И ХУДШУЮ СТРАТЕГИИ (БЕЗ MUNKRES)
+        # Исключаем Munkres алгоритмы из сравнения
+        comparison_results = {
+            'Greedy': avgGreedy,
+            'Thrifty': avgThrifty,
+            'Greedy-Thrifty': avgGreedyThrifty,
+            'Thrifty-Greedy': avgThriftyGreedy
+        }
+        best_strategy = max(comparison_results, key=comparison_results.get)
+        worst_strategy = min(comparison_results, key=comparison_results.get)
+        best_value = comparison_results[best_strategy]
+        worst_value = comparison_results[worst_strategy]
+        
+        # Краткие результаты слева
+        short_text = f"""
+        <h3>Краткие результаты:</h3>
+        <p><b>Идеальное значение (Munkres_Max):</b> {ideal_value:.3f}</p>
+        <p><b>Лучшая стратегия (без Munkres):</b> {best_strategy}</p>
+        <p><b>Результат:</b> {best_value:.3f} ({best_value/ideal_value*100:.1f}% от идеала)</p>
+        <p><b>Худшая стратегия (без Munkres):</b> {worst_strategy}</p>
+        <p><b>Результат:</b> {worst_value:.3f} ({worst_value/ideal_value*100:.1f}% от идеала)</p>
+        <p><b>Разница:</b> {best_value - worst_value:.3f}</p>
+        """
+        if self.experiment_params["adaptive"]:
+            short_text += f"""
+        <p><b>Адаптивный режим:</b> использовано {number_of_experiments} из {self.experiment_params["number_of_experiments"]} экспериментов</p>
+        """
+        self.results_text_left.setHtml(short_text)
+        
+        # Полные результаты справа (сравниваем с ideal_value - Munkres_Max)
+        full_text = f"""
+        <h2>ПОЛНЫЕ РЕЗУЛЬТАТЫ ЭКСПЕРИМЕНТА</h2>
+        
+        <h3>Параметры эксперимента:</h3>
+        <ul>
+            <li><b>Количество экспериментов:</b> {number_of_experiments}</li>
+            <li><b>Размер матрицы:</b> {matrix_size}×{stages}</li>
+            <li><b>Тип распределения:</b> {sugar}</li>
+            <li><b>Alpha диапазон:</b> {alpha_min:.3f} - {alpha_max:.3f}</li>
+            <li><b>Beta диапазон:</b> {beta_min:.3f} - {beta_max:.3f}</li>
+        </ul>
+        
+        <h3>Результаты по стратегиям:</h3>
+        <p><b>Идеальное значение (Munkres_Max):</b> {ideal_value:.3f} (100%)</p>
+        <table border="1" cellpadding="5" cellspacing="0" style="border-collapse: collapse; width: 100%;">
+            <tr style="background-color: #f2f2f2;">
+                <th>Стратегия</th>
+                <th>Среднее значение</th>
+                <th>% от идеала</th>
+            </tr>
+            <tr>
+                <td><b>Венгерский алгоритм (Munkres Min)</b></td>
+                <td>{avgMunkresAlg:.3f}</td>
+                <td>{avgMunkresAlg/ideal_value*100:.1f}%</td>
+            </tr>
+            <tr>
+                <td><b>Венгерский алгоритм (Munkres Max)</b></td>
+                <td>{avgMunkresAlgMax:.3f}</td>
+                <td><b>100.0%</b></td>
+            </tr>
+            <tr>
+                <td><b>Жадная стратегия (Greedy)</b></td>
+                <td>{avgGreedy:.3f}</td>
+                <td>{avgGreedy/ideal_value*100:.1f}%</td>
+            </tr>
+            <tr>
+                <td><b>Бережливая стратегия (Thrifty)</b></td>
+                <td>{avgThrifty:.3f}</td>
+                <td>{avgThrifty/ideal_value*100:.1f}%</td>
+            </tr>
+            <tr>
+                <td><b>Жадно-бережливая (Greedy-Thrifty)</b></td>
+                <td>{avgGreedyThrifty:.3f}</td>
+                <td>{avgGreedyThrifty/ideal_value*100:.1f}%</td>
+            </tr>
+            <tr>
+                <td><b>Бережливо-жадная(Thrifty-Greedy)</b></td>
+                <td>{avgThriftyGreedy:.3f}</td>
+                <td>{avgThriftyGreedy/ideal_value*100:.1f}%</td>
+            </tr>
+        </table>
+        {self.experiment_stats_html(stats) if stats else ""}
+        
+        <h3>Выводы (без учета алгоритмов Munkres):</h3>
+        <ul>
+            <li><b style="color: green;">✓ Лучшая стратегия:</b> {best_strategy} с результатом {best_value:.3f} ({best_value/ideal_value*100:.1f}% от идеала)</li>
+            <li><b style="color: red;">✗ Худшая стратегия:</b> {worst_strategy} с результатом {worst_value:.3f} ({worst_value/ideal_value*100:.1f}% от идеала)</li>
+            <li><b>Разница между лучшей и худшей:</b> {best_value - worst_value:.3f}</li>
+            <li><b>Эффективность лучшей стратегии:</b> {best_value/ideal_value*100:.1f}% от идеального алгоритма</li>
+        </ul>
+        
+        <h3>Рекомендации:</h3>
+        <p>Для данных параметров рекомендуется использовать стратегию <b>{best_strategy}</b>, 
+        так как она показала наилучшие результаты в {number_of_experiments} экспериментах 
+        (без учета алгоритмов Munkres) и достигает {best_value/ideal_value*100:.1f}% от идеального значения.</p>
+        """
+        self.results_text_right.setHtml(full_text)
+        
+        # Переключаемся на вкладку с гистограммой
+        self.tab_widget.setCurrentIndex(0)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -6,11 +6,27 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    # matgen, runner и munkres импортируются внутри функций (ленивая загрузка)
+    hiddenimports=['matgen', 'runner', 'solvers', 'kernels', 'stats', 'munkres'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # Неиспользуемые модули: меньше архив onefile, быстрее распаковка при запуске
+    # numba и llvmlite не упаковываются: в сборке kernels не найдет numba и выберет NumPy
+    excludes=[
+        'tkinter',
+        'numba',
+        'llvmlite',
+        'PySide6.QtNetwork',
+        'PySide6.QtQml',
+        'PySide6.QtQuick',
+        'PySide6.QtPdf',
+        'PySide6.QtWebEngineCore',
+        'PySide6.QtWebEngineWidgets',
+        'PySide6.QtMultimedia',
+        'PySide6.Qt3DCore',
+        'PySide6.QtOpenGL',
+    ],
     noarchive=False,
     optimize=0,
 )
@@ -0,0 +1,164 @@
+"""JIT-ядра numba для kernels.kernel.
+
+Модуль импортируется только при первом запросе бэкенда numba, чтобы
+импорт matgen и runner не платил за загрузку numba. Ядра повторяют
+NumPy-версии операция в операцию, включая выбор первой строки при равных
+значениях (проверяется в test_backends.py).
+"""
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def augment(cost, u, v, row4col, col4row, cur_row, sign=1.0):
+    """solvers._augment: кратчайший увеличивающий путь из строки cur_row"""
+    m = cost.shape[1]
+    shortest = np.full(m, np.inf)
+    final = np.zeros(m)
+    path = np.full(m, -1, dtype=np.intp)
+    unscanned = np.ones(m, dtype=np.bool_)
+    scanned_rows = np.empty(cost.shape[0], dtype=np.intp)
+    scanned = 0
+
+    i = cur_row
+    min_val = 0.0
+    sink = -1
+    while sink == -1:
+        scanned_rows[scanned] = i
+        scanned += 1
+        base = min_val - u[i]
+        for c in range(m):
+            if unscanned[c]:
+                if sign > 0:
+                    reduced = (cost[i, c] - v[c]) + base
+                else:
+                    reduced = -(cost[i, c] + v[c]) + base
+                if reduced < shortest[c]:
+                    path[c] = i
+                    shortest[c] = reduced
+
+        j = 0
+        for c in range(1, m):
+            if shortest[c] < shortest[j]:
+                j = c
+        min_val = shortest[j]
+        if min_val == np.inf:
+            raise ValueError("Матрица не допускает полного назначения")
+
+        final[j] = min_val
+        shortest[j] = np.inf
+        unscanned[j] = False
+        if row4col[j] == -1:
+            sink = j
+        else:
+            i = row4col[j]
+
+    u[cur_row] += min_val
+    for t in range(1, scanned):
+        r = scanned_rows[t]
+        u[r] += min_val - final[col4row[r]]
+    for c in range(m):
+        if not unscanned[c]:
+            v[c] -= min_val - final[c]
+
+    j = sink
+    while True:
+        i = path[j]
+        row4col[j] = i
+        col4row[i], j = j, col4row[i]
+        if i == cur_row:
+            break
+
+@njit(cache=True)
+def walk(params, greedy_columns, picked, start):
+    """algo._walk: выбор строк со столбца start, значения по всем этапам"""
+    n = params.shape[0]
+    steps = picked.shape[0]
+    available = np.ones(n, dtype=np.bool_)
+    for j in range(start):
+        available[picked[j]] = False
+
+    for j in range(start, steps):
+        row = -1
+        for i in range(n):
+            if available[i]:
+                if row == -1:
+                    row = i
+                elif greedy_columns[j]:
+                    if params[i, j] > params[row, j]:
+                        row = i
+                elif params[i, j] < params[row, j]:
+                    row = i
+        picked[j] = row
+        available[row] = False
+
+    values = np.empty(steps, dtype=params.dtype)
+    for j in range(steps):
+        values[j] = params[picked[j], j]
+    return values
+
+@njit(cache=True)
+def batch_values(batch, greedy_masks):
+    """Значения algo._batch_multi_strategy, форма (k, m, min(n, v))"""
+    k, n, v = batch.shape
+    m = greedy_masks.shape[0]
+    steps = min(n, v)
+    values = np.empty((k, m, steps), dtype=batch.dtype)
+    available = np.empty(n, dtype=np.bool_)
+
+    for t in range(k):
+        for s in range(m):
+            available[:] = True
+            for j in range(steps):
+                row = -1
+                for i in range(n):
+                    if available[i]:
+                        if row == -1:
+                            row = i
+                        elif greedy_masks[s, j]:
+                            if batch[t, i, j] > batch[t, row, j]:
+                                row = i
+                        elif batch[t, i, j] < batch[t, row, j]:
+                            row = i
+                available[row] = False
+                values[t, s, j] = batch[t, row, j]
+    return values
+
+@njit(cache=True)
+def _pick(column, available, greedy):
+    """Первая свободная строка с max (greedy) или min значением столбца"""
+    row = -1
+    for i in range(column.shape[0]):
+        if available[i]:
+            if row == -1:
+                row = i
+            elif greedy:
+                if column[i] > column[row]:
+                    row = i
+            elif column[i] < column[row]:
+                row = i
+    return row
+
+@njit(cache=True)
+def hybrid_values(batch, greedy_first):
+    """Значения algo._hybrid_family, форма (k, v + 1, min(n, v))"""
+    k, n, v = batch.shape
+    steps = min(n, v)
+    values = np.empty((k, v + 1, steps), dtype=batch.dtype)
+    prefix_available = np.empty(n, dtype=np.bool_)
+    available = np.empty((steps, n), dtype=np.bool_)
+
+    for t in range(k):
+        prefix_available[:] = True
+        for j in range(steps):
+            column = batch[t, :, j]
+            available[j] = prefix_available
+            for x in range(j + 1):
+                row = _pick(column, available[x], not greedy_first)
+                available[x, row] = False
+                values[t, x, j] = column[row]
+            row = _pick(column, prefix_available, greedy_first)
+            prefix_available[row] = False
+            for x in range(j + 1, v + 1):
+                values[t, x, j] = column[row]
+    return values
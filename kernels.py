@@ -0,0 +1,34 @@
+"""Необязательные JIT-ядра (numba) для горячих циклов.
+
+Если numba установлена, ядра (jit_kernels) компилируются при первом вызове
+(кэш - в __pycache__), иначе используется NumPy. Сама numba импортируется
+только при первом запросе ядра, поэтому импорт matgen и runner от нее не
+замедляется. Оба бэкенда дают одинаковые назначения (см. test_backends.py).
+Бэкенд выбирается на запуск: backend="numpy" или "numba", None - numba,
+если она доступна.
+"""
+import importlib.util
+
+BACKENDS = ("numpy", "numba")
+# Наличие numba проверяется без импорта пакета
+_HAS_NUMBA = importlib.util.find_spec("numba") is not None
+
+
+def resolve_backend(backend: str = None) -> str:
+    """Имя бэкенда: по умолчанию numba, если она установлена"""
+    if backend is None:
+        return "numba" if _HAS_NUMBA else "numpy"
+    if backend not in BACKENDS:
+        raise ValueError(f"backend должен быть одним из: {', '.join(BACKENDS)}")
+    if backend == "numba" and not _HAS_NUMBA:
+        raise ValueError("Бэкенд numba недоступен: пакет numba не установлен")
+    return backend
+
+
+def kernel(name: str, backend: str = None):
+    """JIT-ядро по имени или None, если выбран NumPy"""
+    if resolve_backend(backend) == "numpy":
+        return None
+    # Первый вызов загружает numba и определяет ядра, дальше модуль уже в sys.modules
+    import jit_kernels
+    return getattr(jit_kernels, name)
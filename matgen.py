@@ -1,6 +1,11 @@
+import warnings
 import numpy as np
 from typing import Tuple
-from munkres import Munkres
+from kernels import kernel, resolve_backend
+from solvers import SOLVERS, AssignmentState, auction, auction_epsilon, lapjv
+
+# Наибольший beta_max, при котором элементы строки гарантированно убывают по этапам
+BETA_MAX_LIMIT = 0.99
 
 class MatrixGenerator:    
     def __init__(
@@ -12,6 +17,8 @@ class MatrixGenerator:
         a_max: float = 0.2,
         beta_min: float = 0.93,
         beta_max: float = 0.98,
+        rng: np.random.Generator = None,
+        dtype=np.float64,
     ):
         if n <= 0 or v <= 0:
             raise ValueError("n и v должны быть больше 0")
@@ -20,10 +27,14 @@ class MatrixGenerator:
         if beta_min >= beta_max:
             raise ValueError("beta_min должен быть меньше beta_max")
         if beta_max >= 1.0:
-            print("Внимание: beta_max установлен в 0.99 для гарантии убывания")
-            beta_max = 0.99
+            # В stderr и один раз на процесс: stdout CLI занят CSV
+            warnings.warn(f"beta_max установлен в {BETA_MAX_LIMIT} для гарантии убывания", stacklevel=2)
+            beta_max = BETA_MAX_LIMIT
         if distribution_type not in ["uniform", "concentrated"]:
             raise ValueError("distribution_type должен быть 'uniform' или 'concentrated'")
+        dtype = np.dtype(dtype)
+        if dtype not in (np.float32, np.float64):
+            raise ValueError("dtype должен быть float32 или float64")
         
         self.n = n
         self.v = v
@@ -32,202 +43,451 @@ class MatrixGenerator:
         self.a_max = a_max
         self.beta_min = beta_min
         self.beta_max = beta_max
+        # По умолчанию используется глобальный генератор np.random
+        self._rng = np.random if rng is None else rng
+        # float32 вдвое уменьшает память и трафик пакетов, итоги стратегий
+        # отличаются от float64 на уровне ошибок округления (см. bench.check_dtype)
+        self.dtype = dtype
 
         self._generate_data()
     
-    def _generate_beta_matrix(self) -> np.ndarray:
+    def _generate_beta_matrix(self, k: int = None) -> np.ndarray:
+        size = (self.n, self.v) if k is None else (k, self.n, self.v)
+
         if self.distribution_type == "uniform":
-            beta_matrix = np.random.uniform(
-                self.beta_min, self.beta_max, (self.n, self.v)
-            )
-            
-        elif self.distribution_type == "concentrated":
-            beta_matrix = np.zeros((self.n, self.v))
+            beta = self._rng.uniform(self.beta_min, self.beta_max, size)
+        else:
+            # Для каждой строки свой узкий интервал [beta1, beta1 + delta]
             max_delta = (self.beta_max - self.beta_min) / 4
-            
-            for i in range(self.n):
-                delta_i = np.random.uniform(0, max_delta)
-                
-                beta1_i = np.random.uniform(
-                    self.beta_min, 
-                    self.beta_max - delta_i
-                )
-                
-                beta2_i = beta1_i + delta_i
-                
-                beta_matrix[i] = np.random.uniform(beta1_i, beta2_i, self.v)
-        
-        return beta_matrix
-    
+            delta = self._rng.uniform(0, max_delta, size[:-1] + (1,))
+            beta1 = self._rng.uniform(self.beta_min, self.beta_max - delta)
+            beta = self._rng.uniform(beta1, beta1 + delta, size)
+        return beta.astype(self.dtype, copy=False)
+
+    @staticmethod
+    def _degradation_chain(c0: np.ndarray, beta: np.ndarray) -> np.ndarray:
+        """C[..., j] = c0 * beta[..., 0] * ... * beta[..., j-1]"""
+        C = np.empty(beta.shape, dtype=beta.dtype)
+        C[..., 0] = c0
+        np.cumprod(beta[..., :-1], axis=-1, out=C[..., 1:])
+        C[..., 1:] *= C[..., :1]
+        return C
+
     def _generate_data(self):
-        self.C_matrix = np.random.uniform(
-            self.a_min, self.a_max, (self.n, self.v)
-        )
-        
+        c0 = self._rng.uniform(self.a_min, self.a_max, self.n)
         self.beta_matrix = self._generate_beta_matrix()
+        self.C_matrix = self._degradation_chain(c0, self.beta_matrix)
         
-        for j in range(1, self.v):
-            self.C_matrix[:, j] = self.C_matrix[:, j-1] * self.beta_matrix[:, j-1]
-        
-        self.D_matrix = self.C_matrix.copy()
+        # D_matrix только читается, копия не нужна
+        self.D_matrix = self.C_matrix.view()
     
     def get_D_matrix(self) -> np.ndarray:
         return self.D_matrix
-    
+
+    def generate_batch(self, k: int) -> np.ndarray:
+        """Генерирует k матриц с теми же параметрами одним тензором формы (k, n, v)"""
+        if k <= 0:
+            raise ValueError("k должно быть больше 0")
+
+        c0 = self._rng.uniform(self.a_min, self.a_max, (k, self.n))
+        beta = self._generate_beta_matrix(k)
+        return self._degradation_chain(c0, beta)
+
 class algo:
-    def __init__(self, matrix):
-        self._params = np.array(matrix)
+    # Реестр стратегий: ключ -> (метод, принимает ли точку переключения x)
+    STRATEGIES = {
+        "Munkres-Min": ("Munkres_Alg", False),
+        "Munkres-Max": ("Munkres_Alg_Max", False),
+        "Greedy": ("Greedy", False),
+        "Thrifty": ("Thrifty", False),
+        "Greedy-Thrifty": ("Greedy_Thrifty", True),
+        "Thrifty-Greedy": ("Thrifty_Greedy", True),
+    }
+    # Auction в реестр не входит: он приближенный, не пересчитывается
+    # инкрементально (update) и на больших матрицах долог - вызывается явно
+
+    def __init__(
+        self,
+        matrix,
+        solver: str = "jv",
+        warm_start: "algo" = None,
+        backend: str = None,
+        incremental: bool = False,
+    ):
+        """warm_start - алгоритм похожей матрицы того же размера (например,
+        предыдущей в серии экспериментов): потенциалы его точных решений
+        становятся начальными, и поиск путей короче. backend - "numpy" или
+        "numba" для циклов стратегий и jv (см. kernels), None - numba, если есть.
+        incremental=True - для последующих правок (update, ручной режим):
+        хранится копия матрицы и выбор строк эвристик"""
+        if solver not in SOLVERS:
+            raise ValueError(f"solver должен быть одним из: {', '.join(SOLVERS)}")
+        self._backend = resolve_backend(backend)
+        # Без копии: матрица не изменяется, тип (float32/float64) сохраняется
+        self._params = np.asarray(matrix)
+        self._solver = SOLVERS[solver]
+        self._orders = None
+        self._cache = {}
+        # Состояния точного решателя ("min", "max"): потенциалы для теплого старта
+        # и пересчета после правок. Выбранные строки последовательных стратегий
+        # хранятся только при incremental
+        self._states = {}
+        self._picks = {}
+        # Копия матрицы, с которой update сравнивает новую: _params может быть
+        # массивом вызывающего кода, измененным на месте. Без incremental
+        # (Монте-Карло) копия не делается
+        self._snapshot = self._params.copy() if incremental else None
+        # Берутся только потенциалы, чтобы цепочка алгоритмов не держала матрицы
+        self._warm = {}
+        if warm_start is not None and warm_start._params.shape == self._params.shape:
+            self._warm = {key: state.v for key, state in warm_start._states.items()}
 
     def _params(self):
         return self.__params
+
+    def _cached(self, key, compute):
+        """Результат стратегии считается один раз на матрицу"""
+        if key not in self._cache:
+            total, values = compute()
+            values.flags.writeable = False
+            self._cache[key] = (total, values)
+        return self._cache[key]
+
+    def _sorted_orders(self):
+        """Порядок строк в каждом столбце по возрастанию и по убыванию (считается один раз).
+
+        Массивы имеют форму (v, n): j-я строка - порядок строк j-го столбца.
+        """
+        if self._orders is None:
+            self._orders = self._sort_columns(self._params.T)
+        return self._orders
+
+    @staticmethod
+    def _sort_columns(columns):
+        """Порядки строк для массива столбцов формы (c, n)"""
+        ascending = np.argsort(columns, axis=1)
+        sorted_columns = np.take_along_axis(columns, ascending, axis=1)
+        if np.any(sorted_columns[:, 1:] == sorted_columns[:, :-1]):
+            # При равных значениях выбирается строка с меньшим индексом, как в argmax/argmin.
+            # Для Thrifty это отличие от исходной версии: там минимум искался через
+            # np.argpartition, порядок равных в котором не определен, поэтому на
+            # целых матрицах ручного режима выбор (и итог) Thrifty мог быть другим
+            ascending = np.argsort(columns, axis=1, kind="stable")
+            descending = np.argsort(-columns, axis=1, kind="stable")
+        else:
+            descending = ascending[:, ::-1]
+        return ascending, descending
+
+    def solve(self, key, x=None):
+        """Результат стратегии из реестра STRATEGIES по ключу"""
+        if key not in self.STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия: {key}")
+        method, takes_x = self.STRATEGIES[key]
+        if takes_x:
+            x = self._params.shape[1] // 2 if x is None else x
+            return getattr(self, method)(x)
+        return getattr(self, method)()
+
+    def solve_all(self, x=None):
+        """Результаты всех стратегий реестра: {ключ: (total, values)}"""
+        return {key: self.solve(key, x) for key in self.STRATEGIES}
     
-    def _find_max_in_column(self, column_id, excluded=None):
-        if excluded is None:
-            excluded = set()
-        
-        col = self._params[:, column_id]
-        
-        mask = [i for i in range(len(col)) if i not in excluded]
-        
-        if not mask:
-            return -1, -1
-        
-        valid_values = col[mask]
-        
-        max_val = np.max(valid_values)
-        max_idx_in_valid = np.argmax(valid_values)
-        row_idx = mask[max_idx_in_valid]
-        
-        return max_val, row_idx
-    
-    def _find_k_min_in_column(self, column_id, excluded_rows=None, k=1):
-        if excluded_rows is None:
-            excluded_rows = set()
-        
-        col = self._params[:, column_id]
-        
-        mask = [i for i in range(len(col)) if i not in excluded_rows]
-        
-        if not mask:
-            return -1, -1
-        
-        valid_values = col[mask]
-        
-        k = min(k, len(valid_values))
-        
-        k_smallest_indices = np.argpartition(valid_values, k - 1)
-        kth_idx_in_valid = k_smallest_indices[k - 1]
-        
-        kth_val = valid_values[kth_idx_in_valid]
-        row_idx = mask[kth_idx_in_valid]
-        
-        return kth_val, row_idx
-    
+    def _exact(self, key, maximize):
+        """Точное решение; для jv на квадратной матрице сохраняется состояние для update"""
+        # Состояние не копирует float64-матрицу: при incremental это снимок, а не массив вызывающего
+        cost = self._params if self._snapshot is None else self._snapshot
+        if self._solver is lapjv and cost.shape[0] == cost.shape[1]:
+            if key not in self._states:
+                self._states[key] = AssignmentState(cost, maximize, self._warm.get(key), self._backend)
+            return self._states[key].assignment()
+        return self._solver(cost, maximize)
+
     def Munkres_Alg(self):
         """Венгерский алгоритм для минимизации (min)"""
-        res = 0
-        sizes = self._params.shape
-        assigned = set()
-        values = []
-
-        m = Munkres()
-        indexes = m.compute(self._params.tolist())
-        total = 0
-        for row, column in indexes:
-            value = self._params[row][column]
-            total += value
-            assigned.add(row)
-            values.append(value)
-        return total, np.array(values)
+        def compute():
+            rows, cols = self._exact("min", False)
+            values = self._params[rows, cols]
+            return values.sum(), values
+        return self._cached("min", compute)
     
     def Munkres_Alg_Max(self):
         """Венгерский алгоритм для максимизации (max)"""
-        max_value = np.max(self._params)
-        cost_matrix = max_value - self._params
-        
-        m = Munkres()
-        indexes = m.compute(cost_matrix.tolist())
-        
-        total = 0
-        values = []
-        assigned = set()
-        for row, column in indexes:
-            value = self._params[row][column]  
-            total += value
-            assigned.add(row)
-            values.append(value)
-        return total, np.array(values)
+        def compute():
+            rows, cols = self._exact("max", True)
+            values = self._params[rows, cols]
+            return values.sum(), values
+        return self._cached("max", compute)
+
+    def Auction(self, epsilon: float = None):
+        """Аукцион для максимизации: итог не дальше auction_bound(epsilon) от Munkres_Alg_Max"""
+        def compute():
+            rows, cols = auction(self._params, True, epsilon)
+            values = self._params[rows, cols]
+            return values.sum(), values
+        return self._cached(f"auction {epsilon}", compute)
+
+    def auction_bound(self, epsilon: float = None) -> float:
+        """Гарантированная граница отклонения Auction от оптимума: max(n, v) * epsilon"""
+        if epsilon is None:
+            epsilon = auction_epsilon(self._params)
+        return max(self._params.shape) * epsilon
+
+    def update(self, matrix):
+        """Переходит к измененной матрице того же размера без полного пересчета.
+
+        Точные решения (jv, квадратная матрица) восстанавливаются поиском
+        кратчайших путей из измененных строк или столбцов, последовательные
+        стратегии пересчитываются с первого измененного столбца. Прочие
+        результаты (например, hybrid_sweep) считаются заново при запросе.
+        Без incremental изменения найти не с чем: все считается заново при
+        запросе, точные решения - с теплым стартом от прежних потенциалов.
+        """
+        matrix = np.array(matrix)
+        if matrix.shape != self._params.shape:
+            raise ValueError("Размер матрицы изменился")
+        if self._snapshot is None:
+            self._warm = {key: state.v for key, state in self._states.items()} or self._warm
+            self._params = matrix
+            self._states = {}
+            self._orders = None
+            self._cache = {}
+            return
+        changed = matrix != self._snapshot
+        rows = np.flatnonzero(changed.any(axis=1))
+        columns = np.flatnonzero(changed.any(axis=0))
+        if len(columns) == 0:
+            return
+        # matrix - собственная копия, отдельный снимок не нужен
+        self._params = self._snapshot = matrix
+
+        for state in self._states.values():
+            state.update(matrix, rows, columns)
+
+        if self._orders is not None:
+            ascending, descending = (np.array(order) for order in self._orders)
+            ascending[columns], descending[columns] = self._sort_columns(matrix.T[columns])
+            self._orders = (ascending, descending)
+
+        # Выбор в столбцах до первого измененного не зависит от правки
+        self._cache = {}
+        for key, (greedy_columns, picked) in self._picks.items():
+            total, values = self._walk(greedy_columns, picked, columns[0])
+            values.flags.writeable = False
+            self._cache[key] = (total, values)
 
+    def _sequential_strategy(self, greedy_columns):
+        """Проход по столбцам: в столбцах greedy_columns берется max, в остальных min.
+
+        Строки каждого столбца заранее отсортированы, на шаге берется первая
+        свободная строка в нужном порядке.
+        """
+        greedy_columns = np.asarray(greedy_columns, dtype=bool)
+        key = greedy_columns.tobytes()
+
+        def compute():
+            picked = np.empty(min(self._params.shape), dtype=np.intp)
+            if self._snapshot is not None:
+                self._picks[key] = (greedy_columns, picked)
+            return self._walk(greedy_columns, picked, 0)
+        return self._cached(key, compute)
+
+    def _walk(self, greedy_columns, picked, start):
+        """Выбор строк со столбца start (picked[:start] уже выбраны), результат в picked"""
+        jit = kernel("walk", self._backend)
+        if jit is not None:
+            values = jit(self._params, greedy_columns, picked, start)
+            return values.sum(), values
+
+        ascending, descending = self._sorted_orders()
+        steps = len(picked)
+        available = np.ones(self._params.shape[0], dtype=bool)
+        available[picked[:start]] = False
+
+        for j in range(start, steps):
+            order = descending[j] if greedy_columns[j] else ascending[j]
+            row = order[available[order].argmax()]
+            picked[j] = row
+            available[row] = False
+
+        values = self._params[picked, np.arange(steps)]
+        return values.sum(), values
 
     def Greedy(self):
-        res = 0
         _, cols = self._params.shape
-        assigned = set()
-        values = []
-
-        for i in range(cols):
-            val, row = self._find_max_in_column(i, assigned)
-            
-            if row != -1:
-                res += val
-                assigned.add(row)
-                values.append(val)
-
-        return res, np.array(values)
+        return self._sequential_strategy(np.ones(cols, dtype=bool))
     
     def Thrifty(self):
-        res = 0
         _, cols = self._params.shape
-        assigned = set()
-        values = []
-
-        for i in range(cols):
-            val, row = self._find_k_min_in_column(i, assigned)
-            
-            if row != -1:
-                res += val
-                assigned.add(row)
-                values.append(val)
-
-        return res, np.array(values)
+        return self._sequential_strategy(np.zeros(cols, dtype=bool))
     
     def Greedy_Thrifty(self, x):
-        res = 0
         _, cols = self._params.shape
-        assigned = set()
-        values = []
-
-        for i in range(cols):
-            if i < x:
-                val, row = self._find_max_in_column(i, assigned)
-            else:
-                val, row = self._find_k_min_in_column(i, assigned)
-            
-            if row != -1:
-                res += val
-                assigned.add(row)
-                values.append(val)
-
-        return res, np.array(values)
+        return self._sequential_strategy(np.arange(cols) < x)
     
     def Thrifty_Greedy(self, x):
-        res = 0
         _, cols = self._params.shape
-        assigned = set()
-        values = []
-
-        for i in range(cols):
-            if i < x:
-                val, row = self._find_k_min_in_column(i, assigned)
-            else:
-                val, row = self._find_max_in_column(i, assigned)
-            
-            if row != -1:
-                res += val
-                assigned.add(row)
-                values.append(val)
-
-        return res, np.array(values)
+        return self._sequential_strategy(np.arange(cols) >= x)
+
+    @staticmethod
+    def _batch_strategy(batch, greedy_columns, backend=None):
+        """Стратегия для тензора (k, n, v): в столбцах greedy_columns берется max, в остальных min"""
+        batch = np.asarray(batch)
+        _, values = algo._batch_multi_strategy(batch, np.asarray(greedy_columns, dtype=bool)[None], backend)
+        # Целые матрицы дают целые значения, как и при поэкземплярном расчете
+        values = values[:, 0].astype(batch.dtype, copy=False)
+        return values.sum(axis=1), values
+
+    @staticmethod
+    def _batch_multi_strategy(batch, greedy_masks, backend=None):
+        """Несколько стратегий сразу для тензора (k, n, v).
+
+        greedy_masks имеет форму (m, v): строка i задает столбцы, в которых
+        стратегия i берет max. Возвращает итоги (k, m) и значения (k, m, min(n, v)).
+        Цикл Python идет только по столбцам, шаг - несколько операций над (k, m, n).
+        """
+        batch = np.asarray(batch)
+        if batch.dtype.kind != "f":
+            # Для целых матриц нужна -inf в качестве метки занятой строки
+            batch = batch.astype(np.float64)
+        greedy_masks = np.asarray(greedy_masks, dtype=bool)
+        jit = kernel("batch_values", backend)
+        if jit is not None:
+            values = jit(batch, greedy_masks)
+            return values.sum(axis=2), values
+
+        k, n, v = batch.shape
+        m = greedy_masks.shape[0]
+        steps = min(n, v)
+        # Столбцы подряд в памяти: (v, k, n) вместо шага v между элементами столбца
+        columns = np.ascontiguousarray(batch.transpose(2, 0, 1)[:steps])
+        # max в жадных столбцах и max(-col), то есть min, в бережливых
+        signs = np.where(greedy_masks, 1, -1).astype(batch.dtype)
+        # Занятые строки получают -inf: прибавление дешевле выбора по маске
+        taken = np.zeros(k * m * n, dtype=batch.dtype)
+        signed = np.empty((k, m, n), dtype=batch.dtype)
+        values = np.empty((steps, k * m), dtype=batch.dtype)
+        # Плоские индексы вместо take_along_axis / put_along_axis
+        offsets = np.arange(k * m) * n
+        column_offsets = np.repeat(np.arange(k) * n, m)
+
+        for j in range(steps):
+            col = columns[j]
+            np.multiply(col[:, None, :], signs[None, :, j, None], out=signed)
+            signed += taken.reshape(k, m, n)
+            rows = signed.reshape(k * m, n).argmax(axis=1)
+            values[j] = col.reshape(-1)[column_offsets + rows]
+            taken[offsets + rows] = -np.inf
+
+        values = np.ascontiguousarray(values.T).reshape(k, m, steps)
+        return values.sum(axis=2), values
+
+    @staticmethod
+    def _hybrid_family(batch, greedy_first, backend=None):
+        """Значения одной семьи гибридов для всех x = 0..v, форма (k, v + 1, min(n, v)).
+
+        greedy_first=True - Greedy_Thrifty(x), иначе Thrifty_Greedy(x). Первая
+        стратегия проходится один раз с запоминанием занятых строк перед каждым
+        столбцом x, из этого состояния досчитывается только хвост второй стратегии.
+        """
+        batch = np.asarray(batch)
+        dtype = batch.dtype
+        if batch.dtype.kind != "f":
+            # Для целых матриц нужна -inf в качестве метки занятой строки
+            batch = batch.astype(np.float64)
+        jit = kernel("hybrid_values", backend)
+        if jit is not None:
+            return jit(batch, greedy_first).astype(dtype, copy=False)
+
+        k, n, v = batch.shape
+        steps = min(n, v)
+        columns = np.ascontiguousarray(batch.transpose(2, 0, 1)[:steps])
+        prefix_sign = 1 if greedy_first else -1
+        prefix_taken = np.zeros((k, n), dtype=batch.dtype)
+        prefix = np.empty((k, steps), dtype=batch.dtype)
+        # Занятые строки хвостов: x-й хвост начинается с состояния префикса перед столбцом x
+        taken = np.empty((k, steps, n), dtype=batch.dtype)
+        values = np.empty((k, v + 1, steps), dtype=batch.dtype)
+        instances = np.arange(k)
+
+        for j in range(steps):
+            col = columns[j]
+            taken[:, j] = prefix_taken
+            # Хвосты x = 0..j: max(-prefix_sign * col) по свободным строкам
+            signed = taken[:, :j + 1] - prefix_sign * col[:, None, :]
+            rows = signed.argmax(axis=2)
+            values[:, :j + 1, j] = np.take_along_axis(col, rows, axis=1)
+            np.put_along_axis(taken[:, :j + 1], rows[..., None], -np.inf, axis=2)
+
+            row = (prefix_sign * col + prefix_taken).argmax(axis=1)
+            prefix[:, j] = col[instances, row]
+            prefix_taken[instances, row] = -np.inf
+
+        # Столбцы до x берутся из префикса
+        before_switch = np.arange(steps)[None, :] < np.arange(v + 1)[:, None]
+        np.copyto(values, prefix[:, None, :], where=before_switch[None])
+        return values.astype(dtype, copy=False)
+
+    def hybrid_sweep(self):
+        """Итоги Greedy_Thrifty(x) и Thrifty_Greedy(x) для всех x = 0..v за один проход.
+
+        Результаты заодно попадают в кэш Greedy_Thrifty / Thrifty_Greedy.
+        """
+        v = self._params.shape[1]
+        columns = np.arange(v)
+        sweeps = []
+        for greedy_first in (True, False):
+            values = self._hybrid_family(self._params[None], greedy_first, self._backend)[0]
+            for x, vals in enumerate(values):
+                mask = columns < x if greedy_first else columns >= x
+                self._cached(mask.tobytes(), lambda: (vals.sum(), vals.copy()))
+            sweeps.append(values.sum(axis=1))
+        return tuple(sweeps)
+
+    @staticmethod
+    def hybrid_sweep_batch(batch, backend=None):
+        """hybrid_sweep сразу для k матриц: два массива итогов формы (k, v + 1)"""
+        return tuple(algo._hybrid_family(batch, greedy_first, backend).sum(axis=2) for greedy_first in (True, False))
+
+    @staticmethod
+    def Heuristics_Batch(batch, x, backend=None):
+        """Greedy, Thrifty, Greedy-Thrifty(x) и Thrifty-Greedy(x) для k матриц за один проход.
+
+        Возвращает {стратегия: (итоги (k,), значения по этапам (k, min(n, v)))}.
+        """
+        batch = np.asarray(batch)
+        v = batch.shape[2]
+        columns = np.arange(v)
+        masks = np.array([np.ones(v, dtype=bool), np.zeros(v, dtype=bool), columns < x, columns >= x])
+        _, values = algo._batch_multi_strategy(batch, masks, backend)
+        # Как в _batch_strategy: целые матрицы дают целые значения и итоги
+        values = values.astype(batch.dtype, copy=False)
+        totals = values.sum(axis=2)
+        names = ("Greedy", "Thrifty", "Greedy-Thrifty", "Thrifty-Greedy")
+        return {name: (totals[:, i], values[:, i]) for i, name in enumerate(names)}
+
+    @staticmethod
+    def Greedy_Batch(batch, backend=None):
+        """Жадная стратегия сразу для k матриц"""
+        v = np.shape(batch)[2]
+        return algo._batch_strategy(batch, np.ones(v, dtype=bool), backend)
+
+    @staticmethod
+    def Thrifty_Batch(batch, backend=None):
+        """Бережливая стратегия сразу для k матриц"""
+        v = np.shape(batch)[2]
+        return algo._batch_strategy(batch, np.zeros(v, dtype=bool), backend)
+
+    @staticmethod
+    def Greedy_Thrifty_Batch(batch, x, backend=None):
+        """Жадно-бережливая стратегия сразу для k матриц"""
+        v = np.shape(batch)[2]
+        return algo._batch_strategy(batch, np.arange(v) < x, backend)
+
+    @staticmethod
+    def Thrifty_Greedy_Batch(batch, x, backend=None):
+        """Бережливо-жадная стратегия сразу для k матриц"""
+        v = np.shape(batch)[2]
+        return algo._batch_strategy(batch, np.arange(v) >= x, backend)
 
 if __name__ == "__main__":
     #Example
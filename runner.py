@@ -0,0 +1,242 @@
+import os
+import time
+import numpy as np
+from kernels import resolve_backend
+from matgen import MatrixGenerator, algo
+from stats import difference_stats, experiment_stats, merge_stats, ranking_check
+
+# Стратегии, которые сравниваются между собой (без точных решений)
+HEURISTICS = ("Greedy", "Thrifty", "Greedy-Thrifty", "Thrifty-Greedy")
+# Стратегии Монте-Карло эксперимента: аукцион совпадает с Munkres-Max
+# с точностью до своей границы и в экспериментах не считается
+STRATEGIES = ("Munkres-Min", "Munkres-Max") + HEURISTICS
+
+
+def run_chunk(params, count, x, seed_seq, sweep=False, backend=None):
+    """Считает count экспериментов с собственным генератором случайных чисел"""
+    rng = np.random.default_rng(seed_seq)
+    batch = MatrixGenerator(**params, rng=rng).generate_batch(count)
+    return _solve_batch(batch, x, sweep, backend)
+
+
+def _run_store_chunk(path, start, stop, x, sweep=False, backend=None):
+    """Считает эксперименты над матрицами start..stop набора (процесс открывает memmap сам)"""
+    from store import MatrixStore
+    return _solve_batch(MatrixStore(path)[start:stop], x, sweep, backend)
+
+
+def _solve_batch(batch, x, sweep=False, backend=None):
+    """Итоги всех стратегий для тензора (k, n, v)"""
+    count = len(batch)
+    munkres_min = np.empty(count)
+    munkres_max = np.empty(count)
+    # Матрицы блока однородны: потенциалы предыдущей - теплый старт для следующей
+    previous = None
+    for i, matrix in enumerate(batch):
+        a = algo(matrix, warm_start=previous, backend=backend)
+        munkres_min[i], _ = a.Munkres_Alg()
+        munkres_max[i], _ = a.Munkres_Alg_Max()
+        previous = a
+
+    results = {"Munkres-Min": munkres_min, "Munkres-Max": munkres_max}
+    # Все эвристики одним проходом по столбцам пакета
+    for name, (totals, _) in algo.Heuristics_Batch(batch, x, backend).items():
+        results[name] = totals
+    if sweep:
+        # Итоги для всех точек переключения x = 0..v, форма (count, v + 1)
+        results["Greedy-Thrifty sweep"], results["Thrifty-Greedy sweep"] = algo.hybrid_sweep_batch(batch, backend)
+    return results
+
+
+def plan_chunks(number_of_experiments, chunk_size, seed):
+    """Размеры блоков и их потомки SeedSequence"""
+    if number_of_experiments <= 0:
+        raise ValueError("Количество экспериментов должно быть больше 0")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size должен быть больше 0")
+
+    counts = [chunk_size] * (number_of_experiments // chunk_size)
+    if number_of_experiments % chunk_size:
+        counts.append(number_of_experiments % chunk_size)
+    return counts, np.random.SeedSequence(seed).spawn(len(counts))
+
+
+def iter_experiments(
+    number_of_experiments: int,
+    n: int = 15,
+    v: int = None,
+    distribution_type: str = "uniform",
+    a_min: float = 0.12,
+    a_max: float = 0.2,
+    beta_min: float = 0.93,
+    beta_max: float = 0.98,
+    x: int = None,
+    workers: int = None,
+    seed: int = None,
+    chunk_size: int = 1000,
+    sweep: bool = False,
+    dtype: str = "float64",
+    backend: str = None,
+):
+    """Монте-Карло эксперимент в нескольких процессах, результаты выдаются по блокам.
+
+    Эксперименты делятся на блоки по chunk_size, каждый блок получает свой
+    потомок SeedSequence, поэтому результат при заданном seed не зависит
+    от числа процессов. Блоки выдаются в исходном порядке как словари
+    {стратегия: итоги экспериментов блока}. При sweep=True в блок добавляются
+    итоги гибридных стратегий для всех точек переключения. dtype="float32"
+    вдвое уменьшает объем пакетов матриц. backend - "numpy" или "numba"
+    (kernels.resolve_backend), результаты обоих совпадают.
+    """
+    counts, seeds = plan_chunks(number_of_experiments, chunk_size, seed)
+
+    v = n if v is None else v
+    x = v // 2 if x is None else x
+    params = dict(
+        n=n, v=v, distribution_type=distribution_type,
+        a_min=a_min, a_max=a_max, beta_min=beta_min, beta_max=beta_max, dtype=dtype,
+    )
+    # Проверяем параметры до запуска процессов
+    MatrixGenerator(**params)
+    backend = resolve_backend(backend)
+
+    count = len(counts)
+    args = ([params] * count, counts, [x] * count, seeds, [sweep] * count, [backend] * count)
+    yield from map_chunks(run_chunk, args, workers)
+
+
+def iter_store_experiments(
+    path: str,
+    x: int = None,
+    workers: int = None,
+    chunk_size: int = 1000,
+    sweep: bool = False,
+    start: int = 0,
+    stop: int = None,
+    backend: str = None,
+):
+    """Как iter_experiments, но над матрицами start..stop набора store.MatrixStore.
+
+    Процессы читают свои блоки из memmap сами, матрицы не пересылаются.
+    """
+    from store import MatrixStore
+
+    store = MatrixStore(path)
+    if chunk_size <= 0:
+        raise ValueError("chunk_size должен быть больше 0")
+    stop = len(store) if stop is None else min(stop, len(store))
+    if stop <= start:
+        raise ValueError("Диапазон матриц набора пуст")
+    x = store.shape[2] // 2 if x is None else x
+    backend = resolve_backend(backend)
+
+    starts = list(range(start, stop, chunk_size))
+    stops = starts[1:] + [stop]
+    count = len(starts)
+    args = ([store.data_path] * count, starts, stops, [x] * count, [sweep] * count, [backend] * count)
+    yield from map_chunks(_run_store_chunk, args, workers)
+
+
+def map_chunks(func, args, workers):
+    """Выполняет func по блокам в нескольких процессах, результаты в исходном порядке"""
+    count = len(args[0])
+    workers = os.cpu_count() if workers is None else workers
+    workers = max(1, min(workers, count))
+    if workers == 1:
+        yield from map(func, *args)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        yield from executor.map(func, *args)
+    finally:
+        # При досрочной остановке не ждем оставшиеся блоки
+        executor.shutdown(cancel_futures=True)
+
+
+def run_experiments(number_of_experiments: int, **kwargs):
+    """Монте-Карло эксперимент целиком. Возвращает (суммы, распределения) по стратегиям.
+
+    Параметры те же, что у iter_experiments.
+    """
+    chunks = list(iter_experiments(number_of_experiments, **kwargs))
+
+    distributions = {
+        name: np.concatenate([chunk[name] for chunk in chunks])
+        for name in chunks[0]
+    }
+    sums = {name: totals.sum(axis=0) for name, totals in distributions.items()}
+    return sums, distributions
+
+
+def run_statistics(number_of_experiments: int, **kwargs):
+    """Монте-Карло эксперимент без хранения итогов: {ключ: RunningStats}.
+
+    Для каждой стратегии собирается статистика итогов и отношения итога
+    к Munkres-Max. Параметры те же, что у iter_experiments.
+    """
+    accumulated = {}
+    for chunk in iter_experiments(number_of_experiments, **kwargs):
+        merge_stats(accumulated, experiment_stats(chunk))
+    return accumulated
+
+
+def run_adaptive(
+    max_experiments: int = 1000000,
+    min_experiments: int = 200,
+    max_seconds: float = None,
+    level: float = 0.95,
+    target: float = 0.0,
+    **kwargs
+):
+    """Монте-Карло эксперимент до тех пор, пока не определится лучшая эвристика.
+
+    После каждого блока (начиная с min_experiments) проверяются доверительные
+    интервалы разностей между лучшей стратегией и остальными (см.
+    stats.ranking_check). Уровень интервалов растет с номером проверки, так что
+    вероятность ложной остановки за весь запуск не больше 1 - level. Остановка -
+    когда ранжирование определено, либо исчерпан бюджет max_experiments / max_seconds.
+    Блоки выдаются по порядку, поэтому точка остановки по числу экспериментов
+    не зависит от числа процессов. Остальные параметры - как у iter_experiments.
+    Возвращает (статистика, сведения об остановке).
+    """
+    start = time.monotonic()
+    accumulated = {}
+    differences = {}
+    done = 0
+    looks = 0
+    reason = "budget"
+
+    for chunk in iter_experiments(max_experiments, **kwargs):
+        merge_stats(accumulated, experiment_stats(chunk))
+        merge_stats(differences, difference_stats(chunk, HEURISTICS))
+        done += len(chunk["Greedy"])
+
+        # Ошибка расходуется только на проверки, после которых возможна остановка
+        if done >= min_experiments:
+            looks += 1
+        settled, best, second, interval = ranking_check(accumulated, differences, HEURISTICS, level, target, max(looks, 1))
+        if settled and done >= min_experiments:
+            reason = "settled"
+            break
+        if max_seconds is not None and time.monotonic() - start >= max_seconds:
+            reason = "time"
+            break
+
+    return accumulated, dict(
+        experiments=done,
+        looks=looks,
+        reason=reason,
+        settled=bool(settled),
+        best=best,
+        second=second,
+        difference=interval,
+    )
+
+
+if __name__ == "__main__":
+    #Example
+    sums, distributions = run_experiments(10000, n=15, distribution_type="concentrated", seed=1)
+    for name in STRATEGIES:
+        print(f"{name}: {sums[name]:.3f} (среднее {distributions[name].mean():.4f})")
@@ -0,0 +1,570 @@
+import heapq
+import numpy as np
+from kernels import kernel
+
+
+def _column_reduction(cost: np.ndarray, sign: float = 1.0):
+    """Начальные потенциалы и частичное назначение (редукция столбцов, как в JV).
+
+    sign = -1 - максимизация: решается задача для -cost без копии матрицы.
+    """
+    n, m = cost.shape
+    if sign > 0:
+        v = cost.min(axis=0)
+        best_rows = cost.argmin(axis=0)
+    else:
+        v = -cost.max(axis=0)
+        best_rows = cost.argmax(axis=0)
+    u = np.zeros(n)
+    row4col = np.full(m, -1, dtype=np.intp)
+    col4row = np.full(n, -1, dtype=np.intp)
+
+    for j in np.argsort(v):
+        i = best_rows[j]
+        if col4row[i] == -1:
+            col4row[i] = j
+            row4col[j] = i
+
+    return u, v, row4col, col4row
+
+
+def _row_reduction(cost: np.ndarray, sign: float = 1.0):
+    """Начальные потенциалы для n < m: u - минимумы строк, v = 0.
+
+    Строка сразу получает свой минимальный столбец, если он свободен.
+    Потенциалы свободных столбцов равны (нулю), поэтому частичное назначение
+    оптимально для своего размера, а поиск путей их не меняет.
+    """
+    n, m = cost.shape
+    if sign > 0:
+        u = cost.min(axis=1)
+        best_cols = cost.argmin(axis=1)
+    else:
+        u = -cost.max(axis=1)
+        best_cols = cost.argmax(axis=1)
+    v = np.zeros(m)
+    row4col = np.full(m, -1, dtype=np.intp)
+    col4row = np.full(n, -1, dtype=np.intp)
+
+    for i, j in enumerate(best_cols):
+        if row4col[j] == -1:
+            col4row[i] = j
+            row4col[j] = i
+
+    return u, v, row4col, col4row
+
+
+def _dual_start(cost: np.ndarray, v: np.ndarray, sign: float = 1.0):
+    """Начальное решение по готовым потенциалам столбцов (теплый старт).
+
+    v берется, например, из решения похожей матрицы. Потенциалы строк
+    u - минимумы приведенных стоимостей, строка сразу получает свой
+    минимальный столбец, если он свободен. Чем ближе v к оптимальным,
+    тем меньше строк остается для поиска путей.
+    """
+    n, m = cost.shape
+    v = np.array(v, dtype=np.float64)
+    if v.shape != (m,):
+        raise ValueError(f"Ожидается {m} потенциалов столбцов, получено {v.shape}")
+    reduced = cost - v if sign > 0 else -(cost + v)
+    best_cols = reduced.argmin(axis=1)
+    u = reduced[np.arange(n), best_cols]
+    row4col = np.full(m, -1, dtype=np.intp)
+    col4row = np.full(n, -1, dtype=np.intp)
+
+    for i in np.argsort(u):
+        j = best_cols[i]
+        if row4col[j] == -1:
+            col4row[i] = j
+            row4col[j] = i
+
+    return u, v, row4col, col4row
+
+
+def _augment(cost, u, v, row4col, col4row, cur_row, sign=1.0):
+    """Поиск кратчайшего увеличивающего пути из строки cur_row (Дейкстра по столбцам)"""
+    m = cost.shape[1]
+    # shortest - метки непросмотренных столбцов, для просмотренных там inf,
+    # а окончательные расстояния хранятся в final
+    shortest = np.full(m, np.inf)
+    final = np.zeros(m)
+    path = np.full(m, -1, dtype=np.intp)
+    unscanned = np.ones(m, dtype=bool)
+    reduced = np.empty(m)
+    improved = np.empty(m, dtype=bool)
+    scanned_rows = []
+
+    i = cur_row
+    min_val = 0.0
+    sink = -1
+    while sink == -1:
+        scanned_rows.append(i)
+        if sign > 0:
+            np.subtract(cost[i], v, out=reduced)
+        else:
+            np.add(cost[i], v, out=reduced)
+            np.negative(reduced, out=reduced)
+        reduced += min_val - u[i]
+        np.less(reduced, shortest, out=improved)
+        improved &= unscanned
+        np.copyto(path, i, where=improved)
+        np.copyto(shortest, reduced, where=improved)
+
+        j = int(np.argmin(shortest))
+        min_val = shortest[j]
+        if min_val == np.inf:
+            raise ValueError("Матрица не допускает полного назначения")
+
+        final[j] = min_val
+        shortest[j] = np.inf
+        unscanned[j] = False
+        if row4col[j] == -1:
+            sink = j
+        else:
+            i = row4col[j]
+
+    # Обновление потенциалов
+    scanned_cols = ~unscanned
+    u[cur_row] += min_val
+    for r in scanned_rows[1:]:
+        u[r] += min_val - final[col4row[r]]
+    v[scanned_cols] -= min_val - final[scanned_cols]
+
+    # Чередование вдоль найденного пути
+    j = sink
+    while True:
+        i = path[j]
+        row4col[j] = i
+        col4row[i], j = j, col4row[i]
+        if i == cur_row:
+            break
+
+
+def _augment_function(backend):
+    """_augment или его JIT-версия для выбранного бэкенда"""
+    jit = kernel("augment", backend)
+    return _augment if jit is None else jit
+
+
+def _solve(cost, sign, v, augment=_augment):
+    """Потенциалы и назначение для n <= m"""
+    n, m = cost.shape
+    if v is not None:
+        if n != m:
+            raise ValueError("Теплый старт поддерживается только для квадратной матрицы")
+        u, v, row4col, col4row = _dual_start(cost, v, sign)
+    elif n == m:
+        u, v, row4col, col4row = _column_reduction(cost, sign)
+    else:
+        u, v, row4col, col4row = _row_reduction(cost, sign)
+    for cur_row in np.flatnonzero(col4row == -1):
+        augment(cost, u, v, row4col, col4row, cur_row, sign)
+    return u, v, row4col, col4row
+
+
+def lapjv(cost, maximize: bool = False, v=None, backend: str = None) -> tuple[np.ndarray, np.ndarray]:
+    """Назначение минимальной (maximize=True - максимальной) стоимости
+    методом кратчайших увеличивающих путей.
+
+    Прямоугольная матрица n x m решается без дополнения до квадратной:
+    назначаются min(n, m) пар, время O(min(n, m)^2 * max(n, m)).
+    Пары возвращаются по возрастанию номера строки.
+    v - начальные потенциалы столбцов для квадратной матрицы (см. AssignmentState.v).
+    backend - "numpy" или "numba" (kernels.resolve_backend).
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    n, m = cost.shape
+    if min(n, m) == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    if n > m:
+        if v is not None:
+            raise ValueError("Теплый старт поддерживается только для квадратной матрицы")
+        # Назначаем столбцы строкам транспонированной матрицы
+        cols, rows = lapjv(np.ascontiguousarray(cost.T), maximize, backend=backend)
+        order = np.argsort(rows)
+        return rows[order], cols[order]
+
+    _, _, _, col4row = _solve(cost, -1.0 if maximize else 1.0, v, _augment_function(backend))
+    return np.arange(n), col4row
+
+
+class AssignmentState:
+    """Решение квадратной задачи вместе с потенциалами для последующих правок.
+
+    После изменения строк или столбцов cost оптимум восстанавливается
+    одним поиском кратчайшего пути на каждую измененную строку/столбец
+    (O(n^2) вместо O(n^3) для нового решения). При maximize=True ищется
+    максимум, потенциалы относятся к задаче для -cost.
+
+    Потенциалы столбцов v подходят для теплого старта похожей матрицы
+    того же размера: AssignmentState(other, v=state.v).
+    """
+
+    def __init__(self, cost, maximize: bool = False, v=None, backend: str = None):
+        # float64-матрица не копируется: состояние только читает ее
+        cost = np.asarray(cost, dtype=np.float64)
+        n, m = cost.shape
+        if n != m:
+            raise ValueError("Матрица должна быть квадратной")
+        self.cost = cost
+        self.sign = -1.0 if maximize else 1.0
+        self._augment = _augment_function(backend)
+        self.u, self.v, self.row4col, self.col4row = _solve(cost, self.sign, v, self._augment)
+
+    def assignment(self) -> tuple[np.ndarray, np.ndarray]:
+        return np.arange(len(self.col4row)), self.col4row.copy()
+
+    def update(self, cost, rows=None, columns=None):
+        """Переходит к матрице cost, отличающейся от прежней только в строках rows и столбцах columns.
+
+        Без rows и columns изменения ищутся сравнением с прежней матрицей,
+        поэтому ее нельзя менять на месте - передается новый массив.
+        """
+        cost = np.asarray(cost, dtype=np.float64)
+        if cost.shape != self.cost.shape:
+            raise ValueError("Размер матрицы изменился")
+        if rows is None or columns is None:
+            changed = cost != self.cost
+            rows = np.flatnonzero(changed.any(axis=1))
+            columns = np.flatnonzero(changed.any(axis=0))
+        self.cost = cost
+        if len(rows) == 0:
+            return
+        if len(rows) == 1 and len(columns) == 1:
+            self._update_cell(rows[0], columns[0])
+        elif len(columns) < len(rows):
+            self._repair_columns(columns)
+        else:
+            self._repair_rows(rows)
+
+    def _update_cell(self, i, j):
+        reduced = self.sign * self.cost[i, j] - self.u[i] - self.v[j]
+        if self.col4row[i] == j:
+            if reduced <= 0:
+                # Назначенный элемент подешевел: остальные приведенные стоимости строки только растут
+                self.u[i] += reduced
+                return
+        elif reduced >= 0:
+            # Неназначенный элемент остался не дешевле своей двойственной оценки
+            return
+        self._repair_rows([i])
+
+    def _repair_rows(self, rows):
+        """Снимает назначения строк, делает их потенциалы допустимыми и назначает заново"""
+        for i in rows:
+            self.row4col[self.col4row[i]] = -1
+            self.col4row[i] = -1
+            self.u[i] = (self.sign * self.cost[i] - self.v).min()
+        for i in rows:
+            self._augment(self.cost, self.u, self.v, self.row4col, self.col4row, i, self.sign)
+
+    def _repair_columns(self, columns):
+        free_rows = []
+        for j in columns:
+            i = self.row4col[j]
+            self.col4row[i] = -1
+            self.row4col[j] = -1
+            self.v[j] = (self.sign * self.cost[:, j] - self.u).min()
+            free_rows.append(i)
+        for i in free_rows:
+            self._augment(self.cost, self.u, self.v, self.row4col, self.col4row, i, self.sign)
+
+
+def top_k_candidates(cost, k: int = 8, maximize: bool = False, v=None, block: int = 256):
+    """Разреженный граф кандидатов: для каждого столбца k строк с наименьшей
+    приведенной стоимостью и для каждой строки - k таких столбцов (иначе строки,
+    плохие во всех столбцах, остаются без ребер). Результат - CSR по строкам
+    (indptr, indices, data), data - исходные значения cost.
+
+    Приведенные стоимости считаются от потенциалов v (например, AssignmentState.v
+    похожей матрицы), по умолчанию - от редукции столбцов и строк. Матрица
+    читается блоками строк за один-два прохода, поэтому подходит memmap.
+    """
+    if k <= 0:
+        raise ValueError("k должно быть больше 0")
+    sign = -1.0 if maximize else 1.0
+    n, m = cost.shape
+    k = min(k, n)
+    if v is None:
+        v = np.full(m, np.inf)
+        for start in range(0, n, block):
+            np.minimum(v, (sign * np.asarray(cost[start:start + block], dtype=np.float64)).min(axis=0), out=v)
+    else:
+        v = np.asarray(v, dtype=np.float64)
+
+    # Лучшие k строк каждого столбца обновляются по блокам строк
+    # (порядок внутри столбца зависит только от потенциалов строк),
+    # лучшие k столбцов строки берутся сразу из блока
+    best = np.full((k, m), np.inf)
+    best_rows = np.zeros((k, m), dtype=np.intp)
+    row_k = min(k, m)
+    row_best = []
+    for start in range(0, n, block):
+        reduced = sign * np.asarray(cost[start:start + block], dtype=np.float64) - v
+        reduced -= reduced.min(axis=1, keepdims=True)
+        values = np.concatenate((best, reduced))
+        rows = np.concatenate((best_rows, np.broadcast_to(np.arange(start, start + len(reduced))[:, None], reduced.shape)))
+        top = np.argpartition(values, k - 1, axis=0)[:k]
+        best = np.take_along_axis(values, top, axis=0)
+        best_rows = np.take_along_axis(rows, top, axis=0)
+        row_best.append(np.argpartition(reduced, row_k - 1, axis=1)[:, :row_k].ravel())
+
+    rows = np.concatenate((best_rows.ravel(), np.repeat(np.arange(n), row_k)))
+    cols = np.concatenate((np.broadcast_to(np.arange(m), best_rows.shape).ravel(), np.concatenate(row_best)))
+    # Ребро может попасть в оба списка
+    keys = np.unique(rows * m + cols)
+    rows, cols = keys // m, keys % m
+    indptr = np.zeros(n + 1, dtype=np.intp)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return indptr, cols, np.asarray(cost[rows, cols], dtype=np.float64)
+
+
+def _sparse_augment(indptr, indices, data, u, v, row4col, col4row, cur_row):
+    """Как _augment, но по спискам смежности CSR: Дейкстра с кучей.
+
+    Списки - обычные списки Python: на коротких строках это быстрее NumPy.
+    Возвращает False, если увеличивающего пути нет (состояние не меняется).
+    """
+    shortest = {}
+    final = {}
+    path = {}
+    heap = []
+    scanned_rows = []
+
+    i = cur_row
+    min_val = 0.0
+    while True:
+        scanned_rows.append(i)
+        base = min_val - u[i]
+        for p in range(indptr[i], indptr[i + 1]):
+            j = indices[p]
+            if j in final:
+                continue
+            distance = data[p] - v[j] + base
+            if distance < shortest.get(j, np.inf):
+                shortest[j] = distance
+                path[j] = i
+                heapq.heappush(heap, (distance, j))
+
+        # Из кучи удаляются устаревшие метки
+        while heap and (heap[0][1] in final or heap[0][0] > shortest[heap[0][1]]):
+            heapq.heappop(heap)
+        if not heap:
+            return False
+        min_val, j = heapq.heappop(heap)
+        final[j] = min_val
+        if row4col[j] == -1:
+            break
+        i = row4col[j]
+
+    u[cur_row] += min_val
+    for r in scanned_rows[1:]:
+        u[r] += min_val - final[col4row[r]]
+    for column, distance in final.items():
+        v[column] -= min_val - distance
+
+    while True:
+        i = path[j]
+        row4col[j] = i
+        col4row[i], j = j, col4row[i]
+        if i == cur_row:
+            return True
+
+
+def _sparse_solve(indptr, indices, data, m, sign):
+    """Потенциалы и назначение на графе кандидатов (n <= m) или None,
+    если граф не допускает полного назначения"""
+    n = len(indptr) - 1
+    counts = np.diff(indptr)
+    if np.any(counts == 0):
+        return None
+    row_of = np.repeat(np.arange(n), counts)
+    data = sign * np.asarray(data, dtype=np.float64)
+    # Для квадратной задачи - редукция столбцов по кандидатам, для n < m
+    # потенциалы свободных столбцов должны быть равны, поэтому v = 0
+    v = np.zeros(m)
+    if n == m:
+        v.fill(np.inf)
+        np.minimum.at(v, indices, data)
+        v[np.isinf(v)] = 0.0
+    reduced = data - v[indices]
+    u = np.minimum.reduceat(reduced, indptr[:-1])
+
+    row4col = [-1] * m
+    col4row = [-1] * n
+    tight = np.flatnonzero(reduced == u[row_of])
+    for i, j in zip(row_of[tight].tolist(), indices[tight].tolist()):
+        if col4row[i] == -1 and row4col[j] == -1:
+            col4row[i] = j
+            row4col[j] = i
+
+    u, v = u.tolist(), v.tolist()
+    indptr, indices, data = indptr.tolist(), indices.tolist(), data.tolist()
+    for cur_row in range(n):
+        if col4row[cur_row] == -1 and not _sparse_augment(indptr, indices, data, u, v, row4col, col4row, cur_row):
+            return None
+    return np.array(u), np.array(v), np.array(col4row, dtype=np.intp)
+
+
+def sparse_lapjv(indptr, indices, data, m: int, maximize: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """Точное назначение на разреженном графе CSR (n строк, m >= n столбцов).
+
+    Оптимум ищется только среди ребер графа; если полного назначения нет - ValueError.
+    """
+    solution = _sparse_solve(np.asarray(indptr), np.asarray(indices), data, m, -1.0 if maximize else 1.0)
+    if solution is None:
+        raise ValueError("Граф кандидатов не допускает полного назначения")
+    col4row = solution[2]
+    return np.arange(len(col4row)), col4row
+
+
+def dual_gap_bound(cost, u, v, maximize: bool = False, block: int = 256) -> float:
+    """Верхняя оценка отклонения назначения с потенциалами u, v от оптимума cost.
+
+    Назначение на подграфе оптимально для всей матрицы, если приведенные
+    стоимости всех элементов неотрицательны. Иначе потенциал каждой строки
+    уменьшается на ее худшее нарушение, и сумма нарушений ограничивает
+    разницу с оптимумом. Один проход по блокам строк, O(n * m).
+    """
+    sign = -1.0 if maximize else 1.0
+    bound = 0.0
+    for start in range(0, cost.shape[0], block):
+        reduced = sign * np.asarray(cost[start:start + block], dtype=np.float64) - v
+        reduced -= u[start:start + block, None]
+        bound -= np.minimum(reduced.min(axis=1), 0.0).sum()
+    return bound
+
+
+def lapjv_topk(cost, maximize: bool = False, k: int = 8, v=None) -> tuple[np.ndarray, np.ndarray]:
+    """Назначение по графу k лучших кандидатов каждого столбца с проверкой оптимума.
+
+    Решение на графе принимается, если его потенциалы допустимы для всей
+    матрицы (dual_gap_bound равна нулю) - тогда оно оптимально. Иначе, как и
+    при отсутствии полного назначения на графе, задача решается плотным lapjv
+    (с теплым стартом от потенциалов графа, если они есть). v - потенциалы
+    столбцов похожей матрицы для выбора кандидатов.
+    """
+    n, m = cost.shape
+    if min(n, m) == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    if n > m:
+        cols, rows = lapjv_topk(cost.T, maximize, k)
+        order = np.argsort(rows)
+        return rows[order], cols[order]
+
+    sign = -1.0 if maximize else 1.0
+    indptr, indices, data = top_k_candidates(cost, k, maximize, v)
+    solution = _sparse_solve(indptr, indices, data, m, sign)
+    if solution is None:
+        return lapjv(cost, maximize)
+    u, v, col4row = solution
+    scale = max(np.abs(data).max(), 1.0) * n
+    if dual_gap_bound(cost, u, v, maximize) <= 1e-12 * scale:
+        return np.arange(n), col4row
+    return lapjv(cost, maximize, v if n == m else None)
+
+
+def auction_epsilon(cost, tolerance: float = 1e-4) -> float:
+    """Шаг аукциона по умолчанию: граница max(n, m) * eps равна tolerance
+    от разброса элементов cost"""
+    cost = np.asarray(cost)
+    spread = float(cost.max() - cost.min()) if cost.size else 0.0
+    return tolerance * spread / max(cost.shape) if spread > 0 else tolerance
+
+
+def auction(cost, maximize: bool = False, epsilon: float = None, scaling: float = 5.0) -> tuple[np.ndarray, np.ndarray]:
+    """Назначение аукционом Бертсекаса с масштабированием eps.
+
+    Итог не дальше max(n, m) * epsilon от оптимума (epsilon по умолчанию -
+    auction_epsilon). Все свободные строки делают ставки одновременно
+    (вариант Якоби), один раунд - несколько операций NumPy над (свободные, m).
+    eps начинается с четверти разброса элементов и делится на scaling,
+    назначения, совместимые с новым eps, между фазами сохраняются.
+    Прямоугольная матрица дополняется нулевыми строками или столбцами до
+    квадратной - в отличие от остальных решателей, копией max(n, m)^2:
+    граница точности доказана для квадратной задачи, а прямой аукцион на
+    прямоугольной без обратных фаз ее теряет (цены свободных столбцов после
+    смены eps могут остаться выше цен занятых).
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    n, m = cost.shape
+    if min(n, m) == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    if epsilon is None:
+        epsilon = auction_epsilon(cost)
+    if epsilon <= 0:
+        raise ValueError("epsilon должен быть больше 0")
+    if scaling <= 1:
+        raise ValueError("scaling должен быть больше 1")
+
+    # Аукцион ищет максимум выгоды
+    benefit = cost if maximize else -cost
+    size = max(n, m)
+    if n != m:
+        padded = np.zeros((size, size))
+        padded[:n, :m] = benefit
+        benefit = padded
+    if size == 1:
+        return np.zeros(1, dtype=np.intp), np.zeros(1, dtype=np.intp)
+
+    prices = np.zeros(size)
+    owner = np.full(size, -1, dtype=np.intp)
+    col4row = np.full(size, -1, dtype=np.intp)
+    eps = max((benefit.max() - benefit.min()) / 4, epsilon)
+    everyone = np.arange(size)
+    while True:
+        # Назначения прошлой фазы, нарушающие eps-дополняющую нежесткость
+        # при новом eps, снимаются (в первой фазе назначений еще нет)
+        if col4row[0] != -1:
+            values = benefit - prices
+            broken = np.flatnonzero(values[everyone, col4row] < values.max(axis=1) - eps)
+            owner[col4row[broken]] = -1
+            col4row[broken] = -1
+
+        bidders = np.flatnonzero(col4row == -1)
+        while bidders.size:
+            values = benefit[bidders] - prices
+            top = np.argpartition(values, size - 2, axis=1)[:, -2:]
+            top_values = np.take_along_axis(values, top, axis=1)
+            first = top_values.argmax(axis=1)
+            index = np.arange(len(bidders))
+            targets = top[index, first]
+            bids = prices[targets] + top_values[index, first] - top_values[index, 1 - first] + eps
+
+            # Столбец достается наибольшей ставке, прежний владелец снова свободен
+            order = np.lexsort((bids, targets))
+            targets = targets[order]
+            winner = np.append(targets[1:] != targets[:-1], True)
+            won = targets[winner]
+            prices[won] = bids[order][winner]
+            previous = owner[won]
+            col4row[previous[previous >= 0]] = -1
+            owner[won] = bidders[order][winner]
+            col4row[owner[won]] = won
+            bidders = np.flatnonzero(col4row == -1)
+
+        if eps <= epsilon:
+            break
+        eps = max(eps / scaling, epsilon)
+
+    rows = np.flatnonzero(col4row[:n] < m)
+    return rows, col4row[rows]
+
+
+def munkres(cost, maximize: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """Назначение минимальной (maximize=True - максимальной) стоимости через пакет munkres"""
+    # Импорт при первом вызове: пакет нужен только этому решателю
+    from munkres import Munkres
+
+    cost = np.asarray(cost)
+    indexes = Munkres().compute((-cost if maximize else cost).tolist())
+    rows = np.array([row for row, _ in indexes], dtype=np.intp)
+    cols = np.array([column for _, column in indexes], dtype=np.intp)
+    return rows, cols
+
+
+SOLVERS = {
+    "jv": lapjv,
+    "munkres": munkres,
+    "topk": lapjv_topk,
+}
@@ -0,0 +1,197 @@
+import math
+from statistics import NormalDist
+import numpy as np
+
+
+class RunningStats:
+    """Потоковая статистика постоянного объема памяти.
+
+    Среднее и дисперсия считаются по Уэлфорду (для блоков - формула Чана),
+    квантили - по t-digest. Экземпляры можно объединять через merge, поэтому
+    статистику удобно собирать по блокам и процессам.
+    """
+
+    def __init__(self, compression: float = 200):
+        self.compression = compression
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        # Центроиды t-digest: средние и веса, отсортированы по средним
+        self._means = np.empty(0)
+        self._weights = np.empty(0)
+
+    @classmethod
+    def from_values(cls, values, compression: float = 200):
+        stats = cls(compression)
+        stats.update(values)
+        return stats
+
+    def to_dict(self):
+        """Состояние в виде словаря, пригодного для JSON"""
+        return dict(
+            compression=self.compression,
+            count=self.count,
+            mean=self.mean,
+            m2=self._m2,
+            min=float(self.min),
+            max=float(self.max),
+            means=self._means.tolist(),
+            weights=self._weights.tolist(),
+        )
+
+    @classmethod
+    def from_dict(cls, state):
+        """Восстанавливает статистику, сохраненную to_dict"""
+        stats = cls(state["compression"])
+        stats.count = state["count"]
+        stats.mean = state["mean"]
+        stats._m2 = state["m2"]
+        stats.min = state["min"]
+        stats.max = state["max"]
+        stats._means = np.array(state["means"], dtype=float)
+        stats._weights = np.array(state["weights"], dtype=float)
+        return stats
+
+    def update(self, values):
+        """Добавляет блок значений"""
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return
+        other = RunningStats(self.compression)
+        other.count = values.size
+        other.mean = values.mean()
+        other._m2 = ((values - other.mean) ** 2).sum()
+        other.min = values.min()
+        other.max = values.max()
+        other._means = values
+        other._weights = np.ones(values.size)
+        self.merge(other)
+
+    def merge(self, other):
+        """Объединяет с другой статистикой (результат в self)"""
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta ** 2 * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(
+            np.concatenate([self._means, other._means]),
+            np.concatenate([self._weights, other._weights]),
+        )
+        return self
+
+    def _compress(self, means, weights):
+        """Сжатие центроидов с масштабной функцией k1: мелкие кластеры у хвостов"""
+        order = np.argsort(means, kind="stable")
+        means = means[order]
+        weights = weights[order]
+        cumulative = np.cumsum(weights)
+        q = (cumulative - weights / 2) / cumulative[-1]
+        k = self.compression / (2 * math.pi) * np.arcsin(2 * q - 1)
+        groups = np.floor(k - k[0]).astype(np.intp)
+
+        merged_weights = np.bincount(groups, weights)
+        nonempty = merged_weights > 0
+        self._means = np.bincount(groups, weights * means)[nonempty] / merged_weights[nonempty]
+        self._weights = merged_weights[nonempty]
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def confidence_interval(self, level: float = 0.95):
+        """Доверительный интервал для среднего (нормальное приближение)"""
+        if self.count < 2:
+            return self.mean, self.mean
+        z = NormalDist().inv_cdf(0.5 + level / 2)
+        half = z * self.std / math.sqrt(self.count)
+        return self.mean - half, self.mean + half
+
+    def quantile(self, q: float) -> float:
+        """Приближенный квантиль уровня q по центроидам t-digest"""
+        if self.count == 0:
+            return math.nan
+        cumulative = np.cumsum(self._weights)
+        centers = cumulative - self._weights / 2
+        positions = np.concatenate([[0.0], centers, [cumulative[-1]]])
+        values = np.concatenate([[self.min], self._means, [self.max]])
+        return float(np.interp(q * self.count, positions, values))
+
+
+def experiment_stats(chunk, ideal="Munkres-Max", compression: float = 200):
+    """Статистика блока экспериментов: итоги стратегий и их отношение к ideal"""
+    stats = {}
+    for name, totals in chunk.items():
+        if np.ndim(totals) != 1:
+            continue
+        stats[name] = RunningStats.from_values(totals, compression)
+        if name != ideal:
+            stats[f"{name} / {ideal}"] = RunningStats.from_values(totals / chunk[ideal], compression)
+    return stats
+
+
+def merge_stats(accumulated, stats):
+    """Добавляет статистику блока к накопленной: {ключ: RunningStats}"""
+    for key, value in stats.items():
+        if key in accumulated:
+            accumulated[key].merge(value)
+        else:
+            accumulated[key] = value
+    return accumulated
+
+
+def difference_stats(chunk, names, compression: float = 200):
+    """Статистика попарных разностей итогов стратегий names на одних и тех же матрицах"""
+    stats = {}
+    for i, first in enumerate(names):
+        for second in names[i + 1:]:
+            stats[(first, second)] = RunningStats.from_values(chunk[first] - chunk[second], compression)
+    return stats
+
+
+def sequential_level(level: float, look: int) -> float:
+    """Уровень доверия look-й проверки (с 1) при повторных проверках после каждого блока.
+
+    Ошибка 1 - level расходуется по схеме (1 - level) / (look (look + 1)):
+    сумма по всем проверкам не больше 1 - level, поэтому частые проверки
+    не делают ложную остановку вероятнее.
+    """
+    if look < 1:
+        raise ValueError("look должен быть не меньше 1")
+    return 1 - (1 - level) / (look * (look + 1))
+
+
+def ranking_check(stats, differences, names, level: float = 0.95, target: float = 0.0, look: int = 1):
+    """Проверяет, определена ли лучшая стратегия среди names.
+
+    Берется стратегия с наибольшим средним и доверительные интервалы средней
+    парной разности между ней и каждой из остальных. Уровень интервалов
+    поправлен на номер проверки look (sequential_level) и на число сравнений
+    (Бонферрони), поэтому проверку можно повторять после каждого блока.
+    Ранжирование считается определенным, если каждый интервал лежит выше 0
+    или его полуширина не больше target (стратегии совпадают с заданной точностью).
+    Возвращает (определено ли, лучшая, вторая, (нижняя, верхняя граница) для лучшей и второй).
+    """
+    ranked = sorted(names, key=lambda name: stats[name].mean, reverse=True)
+    best = ranked[0]
+    pair_level = 1 - (1 - sequential_level(level, look)) / (len(names) - 1)
+
+    intervals = []
+    for other in ranked[1:]:
+        if (best, other) in differences:
+            low, high = differences[(best, other)].confidence_interval(pair_level)
+        else:
+            low, high = (-bound for bound in reversed(differences[(other, best)].confidence_interval(pair_level)))
+        intervals.append((low, high))
+    settled = all(low > 0 or (high - low) / 2 <= target for low, high in intervals)
+    return settled, best, ranked[1], intervals[0]
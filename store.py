@@ -0,0 +1,103 @@
+"""Хранилище матриц на диске для воспроизводимых наборов экспериментов.
+
+Набор - два файла: PATH.npy с тензором (count, n, v) и PATH.json с
+параметрами MatrixGenerator, seed и размером блока. Матрицы генерируются
+теми же блоками и потомками SeedSequence, что и в runner.iter_experiments,
+поэтому эксперимент над набором совпадает с экспериментом с тем же seed.
+Файл открывается через memmap: в память читаются только нужные блоки.
+"""
+import json
+import numpy as np
+from matgen import MatrixGenerator
+
+FORMAT_VERSION = 1
+
+
+def _paths(path):
+    base = path[:-4] if path.endswith(".npy") else path
+    return base + ".npy", base + ".json"
+
+
+class MatrixStore:
+    def __init__(self, path: str):
+        """Открывает набор только для чтения"""
+        self.data_path, self.header_path = _paths(path)
+        with open(self.header_path, encoding="utf-8") as f:
+            self.header = json.load(f)
+        if self.header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Неподдерживаемая версия набора: {self.header.get('version')}")
+        self._data = np.load(self.data_path, mmap_mode="r")
+
+    @classmethod
+    def create(
+        cls,
+        path: str,
+        count: int,
+        seed: int = None,
+        chunk_size: int = 1000,
+        **params
+    ):
+        """Генерирует count матриц с параметрами MatrixGenerator и сохраняет их.
+
+        Блоки пишутся в файл по одному, поэтому объем набора не ограничен памятью.
+        Без seed берется случайная энтропия, она записывается в заголовок.
+        """
+        from runner import plan_chunks
+
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        counts, seeds = plan_chunks(count, chunk_size, seed)
+        params.setdefault("v", params.get("n", 15))
+        generator = MatrixGenerator(**params)
+        params["dtype"] = generator.dtype.name
+
+        data_path, header_path = _paths(path)
+        # open_memmap только записывает заголовок .npy, данные дописываются
+        # в файл последовательно и не остаются в памяти процесса
+        data = np.lib.format.open_memmap(
+            data_path, mode="w+", dtype=generator.dtype, shape=(count, generator.n, generator.v)
+        )
+        offset = data.offset
+        del data
+        with open(data_path, "r+b") as f:
+            f.seek(offset)
+            for chunk_count, chunk_seed in zip(counts, seeds):
+                chunk_params = dict(params, rng=np.random.default_rng(chunk_seed))
+                MatrixGenerator(**chunk_params).generate_batch(chunk_count).tofile(f)
+
+        header = dict(version=FORMAT_VERSION, count=count, seed=seed, chunk_size=chunk_size, params=params)
+        with open(header_path, "w", encoding="utf-8") as f:
+            json.dump(header, f, indent=2)
+        return cls(path)
+
+    @property
+    def params(self):
+        """Параметры MatrixGenerator, с которыми создан набор"""
+        return self.header["params"]
+
+    @property
+    def shape(self):
+        return self._data.shape
+
+    def __len__(self):
+        return self._data.shape[0]
+
+    def __getitem__(self, index):
+        """Матрица или срез матриц без копирования (memmap)"""
+        return self._data[index]
+
+    def iter_chunks(self, chunk_size: int = 1000, start: int = 0, stop: int = None):
+        """Блоки (k, n, v) подряд, без копирования"""
+        if chunk_size <= 0:
+            raise ValueError("chunk_size должен быть больше 0")
+        stop = len(self) if stop is None else min(stop, len(self))
+        for begin in range(start, stop, chunk_size):
+            yield self._data[begin:min(begin + chunk_size, stop)]
+
+
+if __name__ == "__main__":
+    #Example
+    store = MatrixStore.create("corpus", 10000, seed=1, n=25, distribution_type="concentrated")
+    print(len(store), store.shape, store.params)
+    for batch in store.iter_chunks(5000):
+        print(batch.shape, batch[:, :, 0].mean())
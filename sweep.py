@@ -0,0 +1,137 @@
+"""Перебор параметров генератора по сетке.
+
+Каждая ячейка сетки - набор параметров MatrixGenerator. Блоки экспериментов
+всех ячеек распределяются по одному пулу процессов, итоговая статистика
+ячейки сохраняется в cache_dir в файле, имя которого - хэш параметров,
+числа экспериментов и seed. При повторном запуске пересекающейся сетки
+считаются только недостающие ячейки. Запуски без seed не кэшируются.
+"""
+import hashlib
+import itertools
+import json
+import os
+import numpy as np
+from kernels import resolve_backend
+from matgen import MatrixGenerator
+from runner import map_chunks, plan_chunks, run_chunk
+from stats import RunningStats, experiment_stats, merge_stats
+
+
+def grid_cells(
+    n=(15,),
+    v=(None,),
+    distribution_type=("uniform",),
+    alpha=((0.12, 0.2),),
+    beta=((0.93, 0.98),),
+):
+    """Все сочетания параметров: список словарей для MatrixGenerator.
+
+    alpha и beta - последовательности диапазонов (min, max), v=None означает v = n.
+    """
+    cells = []
+    for size, stages, distribution, (a_min, a_max), (beta_min, beta_max) in itertools.product(
+        n, v, distribution_type, alpha, beta
+    ):
+        cells.append(dict(
+            n=size, v=size if stages is None else stages, distribution_type=distribution,
+            a_min=a_min, a_max=a_max, beta_min=beta_min, beta_max=beta_max,
+        ))
+    return cells
+
+
+def cell_key(params, number_of_experiments, x, seed, chunk_size):
+    """Хэш ячейки: от него зависит воспроизводимость результата"""
+    description = dict(params, experiments=number_of_experiments, x=x, seed=seed, chunk_size=chunk_size)
+    text = json.dumps(description, sort_keys=True)
+    return hashlib.sha256(text.encode()).hexdigest()[:24]
+
+
+def _load_cell(path):
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    return {name: RunningStats.from_dict(value) for name, value in state["stats"].items()}
+
+
+def _save_cell(path, params, stats):
+    state = dict(params=params, stats={name: value.to_dict() for name, value in stats.items()})
+    # Через временный файл, чтобы прерванный запуск не оставил испорченную ячейку
+    temporary = path + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(temporary, path)
+
+
+def run_grid(
+    cells,
+    number_of_experiments: int,
+    x: int = None,
+    seed: int = None,
+    chunk_size: int = 1000,
+    workers: int = None,
+    cache_dir: str = None,
+    on_cell=None,
+    backend: str = None,
+):
+    """Считает статистику (как run_statistics) для каждой ячейки сетки.
+
+    Все ячейки используют один seed, поэтому сравниваются на общих случайных
+    числах, а результат ячейки совпадает с run_statistics(seed=seed) с теми же
+    параметрами. Без seed берется случайная энтропия, и кэш не используется:
+    ключ с такой энтропией больше не встретится.
+    on_cell(индекс, параметры, статистика, из кэша ли) вызывается по мере готовности ячеек.
+    backend не входит в ключ кэша: результаты бэкендов совпадают.
+    Возвращает список статистик {ключ: RunningStats} в порядке cells.
+    """
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+        cache_dir = None
+    counts, seeds = plan_chunks(number_of_experiments, chunk_size, seed)
+    backend = resolve_backend(backend)
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+
+    results = [None] * len(cells)
+    missing = []
+    for index, params in enumerate(cells):
+        # Проверяем параметры до запуска процессов
+        MatrixGenerator(**params)
+        cell_x = params["v"] // 2 if x is None else x
+        path = None
+        if cache_dir is not None:
+            path = os.path.join(cache_dir, cell_key(params, number_of_experiments, cell_x, seed, chunk_size) + ".json")
+            if os.path.exists(path):
+                results[index] = _load_cell(path)
+                if on_cell is not None:
+                    on_cell(index, params, results[index], True)
+                continue
+        missing.append((index, params, cell_x, path))
+
+    # Блоки всех недостающих ячеек в одной очереди: ячейка за ячейкой, блоки по порядку
+    tasks = [(params, count, cell_x, chunk_seed, False, backend)
+             for _, params, cell_x, _ in missing
+             for count, chunk_seed in zip(counts, seeds)]
+    if not tasks:
+        return results
+
+    chunks = map_chunks(run_chunk, tuple(zip(*tasks)), workers)
+    try:
+        for index, params, _, path in missing:
+            accumulated = {}
+            for chunk in itertools.islice(chunks, len(counts)):
+                merge_stats(accumulated, experiment_stats(chunk))
+            results[index] = accumulated
+            if path is not None:
+                _save_cell(path, params, accumulated)
+            if on_cell is not None:
+                on_cell(index, params, accumulated, False)
+    finally:
+        # Досрочный выход (например, исключение в on_cell) останавливает пул
+        chunks.close()
+    return results
+
+
+if __name__ == "__main__":
+    #Example
+    cells = grid_cells(n=(10, 15), distribution_type=("uniform", "concentrated"))
+    for params, stats in zip(cells, run_grid(cells, 1000, seed=1, cache_dir="sweep_cache")):
+        print(params["n"], params["distribution_type"], f"{stats['Greedy / Munkres-Max'].mean:.4f}")
@@ -0,0 +1,168 @@
+"""Проверки решателей и стратегий (python -m pytest test_backends.py).
+
+NumPy-версии сверяются с эталонами (munkres, новое решение, поэкземплярный
+расчет), ядра numba - с NumPy-версиями. Без numba пропускаются только
+проверки ядер.
+"""
+import importlib.util
+import subprocess
+import sys
+import numpy as np
+import pytest
+
+import solvers
+from matgen import MatrixGenerator, algo
+
+SHAPES = [(1, 1), (5, 5), (6, 9), (9, 6), (25, 25), (60, 60)]
+
+requires_numba = pytest.mark.skipif(importlib.util.find_spec("numba") is None, reason="numba не установлена")
+
+
+def _batch(n, v, k=20, seed=0):
+    rng = np.random.default_rng(seed)
+    batch = MatrixGenerator(n, v, rng=rng).generate_batch(k)
+    # Равные значения проверяют выбор первой строки при совпадениях
+    batch[::3] = np.round(batch[::3], 2)
+    batch[1::3] = rng.integers(0, 4, batch[1::3].shape)
+    return batch
+
+
+@requires_numba
+@pytest.mark.parametrize("n, v", SHAPES)
+def test_walk(n, v):
+    for matrix in _batch(n, v):
+        for greedy_columns in (np.ones(v, bool), np.zeros(v, bool), np.arange(v) < v // 2, np.arange(v) % 2 == 0):
+            for start in (0, min(n, v) // 2):
+                a_numpy, a_numba = algo(matrix, backend="numpy"), algo(matrix, backend="numba")
+                prefix = np.empty(min(n, v), dtype=np.intp)
+                a_numpy._walk(greedy_columns, prefix, 0)
+
+                picked_numpy, picked_numba = prefix.copy(), prefix.copy()
+                total_numpy, values_numpy = a_numpy._walk(greedy_columns, picked_numpy, start)
+                total_numba, values_numba = a_numba._walk(greedy_columns, picked_numba, start)
+                assert np.array_equal(picked_numpy, picked_numba)
+                assert np.array_equal(values_numpy, values_numba)
+                assert total_numpy == total_numba
+
+
+@requires_numba
+@pytest.mark.parametrize("n, v", SHAPES)
+@pytest.mark.parametrize("sign", [1.0, -1.0])
+def test_augment(n, v, sign):
+    import jit_kernels
+
+    for matrix in _batch(n, v):
+        cost = np.asarray(matrix if n <= v else matrix.T, dtype=np.float64)
+        expected = solvers._solve(cost, sign, None, solvers._augment)
+        result = solvers._solve(cost, sign, None, jit_kernels.augment)
+        for a, b in zip(expected, result):
+            assert np.array_equal(a, b)
+
+
+@requires_numba
+@pytest.mark.parametrize("maximize", [False, True])
+def test_augment_repair(maximize):
+    """Пересчет AssignmentState после правок тоже идет через ядро augment"""
+    rng = np.random.default_rng(1)
+    matrix = _batch(30, 30, k=1)[0]
+    states = [solvers.AssignmentState(matrix, maximize, backend=backend) for backend in ("numpy", "numba")]
+    for _ in range(20):
+        matrix = matrix.copy()
+        if rng.random() < 0.5:
+            matrix[rng.integers(30), rng.integers(30)] = rng.random()
+        else:
+            matrix[rng.integers(30)] = rng.random(30)
+        for state in states:
+            state.update(matrix)
+        assert np.array_equal(states[0].col4row, states[1].col4row)
+
+
+@requires_numba
+@pytest.mark.parametrize("n, v", SHAPES)
+def test_batch_values(n, v):
+    batch = _batch(n, v)
+    masks = np.array([np.ones(v, bool), np.zeros(v, bool), np.arange(v) < v // 2, np.arange(v) >= v // 2])
+    expected = algo._batch_multi_strategy(batch, masks, "numpy")
+    result = algo._batch_multi_strategy(batch, masks, "numba")
+    for a, b in zip(expected, result):
+        assert np.array_equal(a, b)
+
+
+@requires_numba
+@pytest.mark.parametrize("n, v", SHAPES)
+def test_hybrid_values(n, v):
+    batch = _batch(n, v)
+    for a, b in zip(algo.hybrid_sweep_batch(batch, "numpy"), algo.hybrid_sweep_batch(batch, "numba")):
+        assert np.array_equal(a, b)
+
+
+def test_numba_imported_lazily():
+    """Импорт matgen и runner не загружает numba"""
+    code = "import sys, matgen, runner; print('numba' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "False"
+
+
+@pytest.mark.parametrize("n, v", SHAPES)
+@pytest.mark.parametrize("maximize", [False, True])
+def test_lapjv_matches_munkres(n, v, maximize):
+    for matrix in _batch(n, v, k=5):
+        rows, cols = solvers.lapjv(matrix, maximize, backend="numpy")
+        rows_ref, cols_ref = solvers.munkres(matrix, maximize)
+        assert len(rows) == len(rows_ref) == min(n, v)
+        assert len(set(rows)) == len(set(cols)) == min(n, v)
+        assert np.isclose(matrix[rows, cols].sum(), matrix[rows_ref, cols_ref].sum())
+
+
+@pytest.mark.parametrize("incremental", [True, False])
+def test_update_matches_fresh_solve(incremental):
+    rng = np.random.default_rng(2)
+    for _ in range(30):
+        n = int(rng.integers(2, 15))
+        matrix = rng.random((n, n))
+        a = algo(matrix, incremental=incremental, backend="numpy")
+        a.solve_all()
+        for _ in range(3):
+            # Правки на месте: update должен найти их и в массиве вызывающего кода
+            matrix[rng.integers(n)] = rng.random(n)
+            matrix[rng.integers(n), rng.integers(n)] = rng.random()
+            a.update(matrix)
+            reference = algo(matrix.copy(), backend="numpy")
+            for key in algo.STRATEGIES:
+                assert np.isclose(a.solve(key)[0], reference.solve(key)[0]), key
+
+
+@pytest.mark.parametrize("n, v", SHAPES)
+def test_batch_matches_instances(n, v):
+    batch = _batch(n, v)
+    x = v // 2
+    packed = algo.Heuristics_Batch(batch, x, "numpy")
+    single = {
+        "Greedy": algo.Greedy_Batch(batch, "numpy"),
+        "Thrifty": algo.Thrifty_Batch(batch, "numpy"),
+        "Greedy-Thrifty": algo.Greedy_Thrifty_Batch(batch, x, "numpy"),
+        "Thrifty-Greedy": algo.Thrifty_Greedy_Batch(batch, x, "numpy"),
+    }
+    for i, matrix in enumerate(batch):
+        a = algo(matrix, backend="numpy")
+        for key, (totals, values) in single.items():
+            total, expected = a.solve(key, x)
+            assert np.array_equal(values[i], expected)
+            assert totals[i] == total
+            assert np.array_equal(packed[key][1][i], expected)
+            assert packed[key][0][i] == total
+
+
+def test_batch_keeps_integer_dtype():
+    batch = _batch(6, 6)[1::3].astype(np.int64)
+    for totals, values in list(algo.Heuristics_Batch(batch, 3, "numpy").values()) + [algo.Greedy_Batch(batch, "numpy")]:
+        assert totals.dtype == values.dtype == batch.dtype
+
+
+@pytest.mark.parametrize("n, v", SHAPES)
+def test_hybrid_sweep_matches_each_x(n, v):
+    for matrix in _batch(n, v, k=5):
+        greedy_thrifty, thrifty_greedy = algo(matrix, backend="numpy").hybrid_sweep()
+        a = algo(matrix, backend="numpy")
+        assert np.array_equal(greedy_thrifty, [a.Greedy_Thrifty(x)[0] for x in range(v + 1)])
+        assert np.array_equal(thrifty_greedy, [a.Thrifty_Greedy(x)[0] for x in range(v + 1)])